@@ -0,0 +1,224 @@
+"""
+Módulo con el procesamiento por frame de la aplicación de realidad aumentada.
+
+Agrupa el estado que antes vivía en el bucle principal (detector de manos, caché de marcadores,
+rectángulos desplazables y cursor) para poder ejecutar varias instancias independientes, por
+ejemplo una por cámara.
+"""
+
+import cv2
+import numpy as np
+from typing import Any, List, Mapping, Optional, Tuple
+
+from augment_markers import find_aruco_markers, augment_aruco
+from hand_detector import HandDetector
+from media_source import MediaSource
+from overlay_scheduler import OverlayScheduler
+from marker_cache import MarkerCache
+from draggable_rectangle import DragRectangle
+import constants
+
+
+class ARPipeline:
+    """
+    Clase que procesa un frame: detección de manos, interacción por gestos, detección de
+    marcadores ArUco y superposición de las imágenes aumentadas.
+    """
+
+    def __init__(
+        self,
+        augmented_images: Mapping[int, np.ndarray],
+        enable_hand_detection: bool = constants.ENABLE_HAND_DETECTION,
+        show_rectangles: bool = constants.SHOW_RECTANGLES,
+        frame_width: int = constants.CAMERA_WIDTH,
+        frame_height: int = constants.CAMERA_HEIGHT,
+        media_sources: Optional[Mapping[int, MediaSource]] = None,
+        enable_overlay_scheduler: bool = constants.ENABLE_OVERLAY_SCHEDULER
+    ) -> None:
+        self.augmented_images: Mapping[int, np.ndarray] = augmented_images
+        # Contenido animado por marcador; tiene prioridad sobre la imagen estática del mismo ID
+        self.media_sources: Mapping[int, MediaSource] = media_sources or {}
+        self.show_rectangles: bool = show_rectangles
+        self.frame_width: int = frame_width
+        self.frame_height: int = frame_height
+
+        # Planificador de superposiciones por tamaño del marcador (None = superposición completa siempre)
+        self.overlay_scheduler: Optional[OverlayScheduler] = OverlayScheduler() if enable_overlay_scheduler else None
+
+        # Inicializar el detector de manos si está habilitado
+        self.hand_detector: Optional[HandDetector] = HandDetector(max_hands=2) if enable_hand_detection else None
+
+        # Inicializar la caché de marcadores
+        self.marker_cache: MarkerCache = MarkerCache()
+
+        # Inicializar los rectángulos desplazables
+        self.drag_rectangles: List[DragRectangle] = [
+            DragRectangle(center_position=(100, 100), size=(100, 100), color=(255, 0, 255)),
+            DragRectangle(center_position=(300, 100), size=(100, 100), color=(255, 255, 0)),
+            DragRectangle(center_position=(500, 100), size=(100, 100), color=(0, 255, 255))
+        ]
+
+        # Variables para el control del movimiento
+        self.prev_loc_x: int = 0
+        self.prev_loc_y: int = 0
+
+        # Variable para el cursor
+        self.cursor: Tuple[int, int] = (0, 0)
+
+        # Resultados del último frame procesado
+        self.current_markers: Tuple[List[Any], Any] = ([], None)
+        self.landmark_list: List[List[int]] = []
+
+    def process(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Procesa un frame completo y devuelve el frame aumentado.
+
+        Args:
+            frame (np.ndarray): Frame capturado de la cámara.
+
+        Returns:
+            np.ndarray: Frame con las manos, los marcadores aumentados y los rectángulos dibujados.
+        """
+        # Detección de manos si está habilitada
+        if self.hand_detector is not None:
+            frame = self._process_hands(frame)
+
+        # Detección de marcadores ArUco
+        aruco_bboxes, aruco_ids = find_aruco_markers(frame)
+        current_markers = (aruco_bboxes, aruco_ids)
+        self.current_markers = self.marker_cache.update_cache(current_markers)
+
+        # Marcadores detectados seguidos de los fijados (pinned), en orden de dibujo
+        markers = self._markers_to_augment()
+
+        # Solo el contenido animado de los marcadores visibles (detectados o fijados) avanza
+        if self.media_sources:
+            visible_ids = {marker_id for marker_id, _ in markers}
+            for marker_id, media_source in self.media_sources.items():
+                media_source.set_visible(marker_id in visible_ids)
+
+        # Superponer el contenido aumentado en cada marcador
+        if self.overlay_scheduler is not None:
+            frame = self.overlay_scheduler.composite(frame, markers, self._content)
+        else:
+            for marker_id, bbox in markers:
+                content = self._content(marker_id)
+                if content is not None:
+                    frame = augment_aruco(bbox, marker_id, frame, content)
+
+        # Dibujar los rectángulos desplazables si está habilitado
+        if self.show_rectangles:
+            frame = self._draw_rectangles(frame)
+
+        return frame
+
+    def _markers_to_augment(self) -> List[Tuple[int, Any]]:
+        """
+        Reúne los marcadores detectados (o en caché) y los fijados.
+
+        Returns:
+            List[Tuple[int, Any]]: ID y coordenadas de cada marcador.
+        """
+        markers: List[Tuple[int, Any]] = []
+        if self.current_markers[0]:
+            # Los IDs llegan como filas (1,) de OpenCV: se aplanan antes de convertirlos a int
+            for bbox, marker_id in zip(self.current_markers[0], np.asarray(self.current_markers[1]).reshape(-1)):
+                markers.append((int(marker_id), bbox))
+        for pinned_markers in self.marker_cache.pinned_markers:
+            for bbox, marker_id in zip(pinned_markers[0], np.asarray(pinned_markers[1]).reshape(-1)):
+                markers.append((int(marker_id), bbox))
+        return markers
+
+    def _content(self, marker_id: int) -> Optional[np.ndarray]:
+        """
+        Devuelve el contenido del marcador: el frame actual del video o la imagen estática.
+
+        Args:
+            marker_id (int): ID del marcador.
+
+        Returns:
+            Optional[np.ndarray]: Contenido, o None si el marcador no tiene.
+        """
+        if marker_id in self.media_sources:
+            return self.media_sources[marker_id].current_frame()
+        return self.augmented_images.get(marker_id)
+
+    def _process_hands(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Detecta las manos y aplica las interacciones por gestos (mover y fijar).
+
+        Args:
+            frame (np.ndarray): Frame capturado de la cámara.
+
+        Returns:
+            np.ndarray: Frame con las manos y el cursor dibujados.
+        """
+        frame = self.hand_detector.find_hands(frame)
+        landmark_list, _ = self.hand_detector.find_position(frame, draw=False)
+        self.landmark_list = landmark_list
+        if not landmark_list:
+            return frame
+
+        # Obtener la posición del dedo índice
+        x_index, y_index = landmark_list[8][1], landmark_list[8][2]
+        fingers = self.hand_detector.fingers_up()
+
+        # Modo de movimiento: solo el índice levantado
+        if len(fingers) > 0 and fingers[1] == 1 and fingers[2] == 0:
+            # Convertir coordenadas
+            frame_reduction = constants.FRAME_REDUCTION
+            screen_x = np.interp(
+                x_index,
+                (frame_reduction, self.frame_width - frame_reduction),
+                (0, self.frame_width)
+            )
+            screen_y = np.interp(
+                y_index,
+                (frame_reduction, self.frame_height - frame_reduction),
+                (0, self.frame_height)
+            )
+            # Suavizar el movimiento
+            curr_loc_x = int(self.prev_loc_x + (screen_x - self.prev_loc_x) / constants.SMOOTHENING)
+            curr_loc_y = int(self.prev_loc_y + (screen_y - self.prev_loc_y) / constants.SMOOTHENING)
+            self.prev_loc_x, self.prev_loc_y = curr_loc_x, curr_loc_y
+            # Dibujar el cursor en la imagen
+            cv2.circle(frame, (x_index, y_index), 15, (255, 0, 255), cv2.FILLED)
+            self.cursor = (x_index, y_index)
+            # Actualizar la posición de los rectángulos desplazables
+            for rect in self.drag_rectangles:
+                rect.update(self.cursor)
+
+        # Modo de clic: índice y dedo medio levantados
+        if len(fingers) > 0 and fingers[1] == 1 and fingers[2] == 1:
+            distance, frame, line_info = self.hand_detector.find_distance(8, 12, frame)
+            if distance < constants.CLICK_DISTANCE_THRESHOLD:
+                cv2.circle(frame, (line_info[4], line_info[5]), 15, (0, 255, 0), cv2.FILLED)
+                # Fijar el marcador en la caché
+                if self.marker_cache.cached_markers is not None:
+                    self.marker_cache.pin_marker(self.marker_cache.cached_markers)
+            else:
+                self.marker_cache.clear_pinned_markers()
+
+        return frame
+
+    def _draw_rectangles(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Dibuja los rectángulos desplazables con transparencia.
+
+        Args:
+            frame (np.ndarray): Frame sobre el que dibujar.
+
+        Returns:
+            np.ndarray: Frame con los rectángulos dibujados.
+        """
+        overlay = np.zeros_like(frame, np.uint8)
+        for rect in self.drag_rectangles:
+            cx, cy = rect.center_position
+            width, height = rect.size
+            top_left = (cx - width // 2, cy - height // 2)
+            bottom_right = (cx + width // 2, cy + height // 2)
+            cv2.rectangle(overlay, top_left, bottom_right, rect.color, cv2.FILLED)
+        alpha = 0.5
+        mask = overlay.astype(bool)
+        frame[mask] = cv2.addWeighted(frame, alpha, overlay, 1 - alpha, 0)[mask]
+        return frame
@@ -0,0 +1,104 @@
+"""
+Módulo para gestionar los presets de ``aruco.DetectorParameters``.
+
+Los presets se guardan en un archivo YAML (por defecto ``config/aruco_presets.yaml``) generado
+por ``tune_detector_parameters.py``. Cada preset indica solo los parámetros que difieren de los
+valores por defecto de OpenCV, junto con las métricas medidas durante el ajuste.
+"""
+
+import os
+import cv2.aruco as aruco
+import yaml
+from typing import Any, Dict, Mapping, Optional
+
+from constants import ARUCO_PRESETS_PATH
+
+# Nombre del preset que usa los parámetros por defecto de OpenCV
+DEFAULT_PRESET: str = "default"
+
+
+def create_detector_parameters(settings: Mapping[str, Any]) -> aruco.DetectorParameters:
+    """
+    Crea un ``DetectorParameters`` aplicando los valores indicados sobre los valores por defecto.
+
+    Args:
+        settings (Mapping[str, Any]): Nombre del parámetro de OpenCV y su valor.
+
+    Returns:
+        aruco.DetectorParameters: Parámetros del detector.
+    """
+    parameters = aruco.DetectorParameters()
+    for name, value in settings.items():
+        if not hasattr(parameters, name):
+            raise ValueError(f"Parámetro de detección desconocido: {name}")
+        current = getattr(parameters, name)
+        # Respetar el tipo que espera OpenCV (los YAML pueden traer 3 en lugar de 3.0, etc.)
+        if isinstance(current, bool):
+            value = bool(value)
+        elif isinstance(current, int):
+            value = int(value)
+        elif isinstance(current, float):
+            value = float(value)
+        setattr(parameters, name, value)
+    return parameters
+
+
+def load_presets(path: str = ARUCO_PRESETS_PATH) -> Dict[str, Dict[str, Any]]:
+    """
+    Carga los presets del archivo YAML.
+
+    Args:
+        path (str): Ruta al archivo de presets.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Presets por nombre, cada uno con ``parameters`` y ``metrics``.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"El archivo de presets de ArUco no existe: {path}")
+    with open(path, 'r', encoding='utf-8') as f:
+        config: Dict[str, Any] = yaml.safe_load(f) or {}
+    return config.get('presets', {})
+
+
+def load_detector_parameters(preset: str, path: str = ARUCO_PRESETS_PATH) -> aruco.DetectorParameters:
+    """
+    Devuelve los parámetros del detector para un preset con nombre.
+
+    Args:
+        preset (str): Nombre del preset ("fast", "balanced", "robust"... o "default").
+        path (str): Ruta al archivo de presets.
+
+    Returns:
+        aruco.DetectorParameters: Parámetros del detector.
+    """
+    if preset == DEFAULT_PRESET:
+        return aruco.DetectorParameters()
+    presets = load_presets(path)
+    if preset not in presets:
+        raise ValueError(f"Preset de ArUco desconocido: {preset} (disponibles: {', '.join(sorted(presets))})")
+    return create_detector_parameters(presets[preset].get('parameters', {}))
+
+
+def save_presets(
+    presets: Mapping[str, Mapping[str, Any]],
+    path: str = ARUCO_PRESETS_PATH,
+    metadata: Optional[Mapping[str, Any]] = None
+) -> None:
+    """
+    Guarda los presets en un archivo YAML.
+
+    Args:
+        presets (Mapping[str, Mapping[str, Any]]): Presets por nombre (``parameters`` y ``metrics``).
+        path (str): Ruta del archivo de presets.
+        metadata (Optional[Mapping[str, Any]]): Información del ajuste (diccionario, conjunto de datos...).
+    """
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory, exist_ok=True)
+    config: Dict[str, Any] = {}
+    if metadata:
+        config['tuning'] = dict(metadata)
+    config['presets'] = {name: dict(preset) for name, preset in presets.items()}
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("# Presets de aruco.DetectorParameters generados por tune_detector_parameters.py\n")
+        yaml.safe_dump(config, f, sort_keys=False, allow_unicode=True)
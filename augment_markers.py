@@ -6,9 +6,23 @@ import cv2
 import cv2.aruco as aruco
 import numpy as np
 import os
-from typing import Tuple, List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Tuple, List, Dict, Any, Optional
 
-from constants import ARUCO_DICT, ARUCO_MARKER_SIZE, ARUCO_TOTAL_MARKERS
+from aruco_presets import load_detector_parameters
+from constants import (
+    ARUCO_DICT,
+    ARUCO_DETECTOR_PRESET,
+    ARUCO_MARKER_SIZE,
+    ARUCO_TOTAL_MARKERS,
+    ARUCO_PYRAMID_LEVELS,
+    ARUCO_PYRAMID_REFINE_ITERATIONS,
+    ARUCO_TILE_GRID,
+    ARUCO_TILE_OVERLAP,
+    ARUCO_TILE_WORKERS,
+    MEDIA_VIDEO_EXTENSIONS,
+)
 
 
 def load_augmented_images(folder_path: str) -> Dict[int, np.ndarray]:
@@ -28,6 +42,9 @@ def load_augmented_images(folder_path: str) -> Dict[int, np.ndarray]:
         raise FileNotFoundError(f"No se pudo acceder a la carpeta {folder_path}: {e}")
 
     for image_file in image_files:
+        # Los videos y GIFs se cargan como contenido animado (ver media_source)
+        if os.path.splitext(image_file)[1].lower() in MEDIA_VIDEO_EXTENSIONS:
+            continue
         try:
             # Se asume que el nombre del archivo es el ID del marcador
             marker_id: int = int(os.path.splitext(image_file)[0])
@@ -42,11 +59,251 @@ def load_augmented_images(folder_path: str) -> Dict[int, np.ndarray]:
     return augmented_images
 
 
+@lru_cache(maxsize=None)
+def get_aruco_detector(preset: str = ARUCO_DETECTOR_PRESET) -> aruco.ArucoDetector:
+    """
+    Devuelve el detector de ArUco, creado una sola vez por preset y reutilizado en cada frame.
+
+    Args:
+        preset (str): Preset de ``DetectorParameters`` (ver ``aruco_presets``).
+
+    Returns:
+        aruco.ArucoDetector: Detector para el diccionario configurado.
+    """
+    aruco_dictionary = aruco.getPredefinedDictionary(ARUCO_DICT)
+    aruco_parameters = load_detector_parameters(preset)
+    return aruco.ArucoDetector(aruco_dictionary, aruco_parameters)
+
+
+def pyramid_refine_window(pyramid_levels: int) -> int:
+    """
+    Semiventana de ``cornerSubPix`` para refinar a resolución completa las esquinas detectadas
+    en el nivel ``pyramid_levels``. Las esquinas del nivel reducido se desvían hasta unos
+    ``1.3 * 2**pyramid_levels`` píxeles, por lo que la ventana cubre ``1.5 * 2**pyramid_levels``
+    más un margen de 2 píxeles.
+
+    Args:
+        pyramid_levels (int): Nivel de la pirámide (0 = resolución completa).
+
+    Returns:
+        int: Semiventana en píxeles.
+    """
+    return int(1.5 * 2 ** pyramid_levels) + 2
+
+
+def detect_markers_pyramid(
+    gray_image: np.ndarray,
+    pyramid_levels: int,
+    preset: str = ARUCO_DETECTOR_PRESET
+) -> Tuple[List[Any], Any]:
+    """
+    Detección de grueso a fino: detecta los marcadores en la imagen reducida ``2**pyramid_levels``
+    veces y refina sus esquinas con ``cornerSubPix`` en la imagen de resolución completa, en
+    ventanas pequeñas alrededor de cada esquina.
+
+    El tamaño mínimo detectable crece con el nivel: como regla conservadora, un marcador necesita
+    unos 24 píxeles de lado en la imagen reducida, es decir, ``24 * 2**pyramid_levels`` píxeles a
+    resolución completa (en el nivel 2 el mínimo medido está entre 56 y 96 píxeles según la
+    resolución; ver la tabla del README).
+
+    Args:
+        gray_image (np.ndarray): Imagen en escala de grises a resolución completa.
+        pyramid_levels (int): Número de niveles de reducción (cada nivel divide el tamaño por 2).
+        preset (str): Preset de ``DetectorParameters``.
+
+    Returns:
+        Tuple[List[Any], Any]: Esquinas a resolución completa e IDs de los marcadores detectados.
+    """
+    scale = 2 ** pyramid_levels
+    height, width = gray_image.shape[:2]
+    small_image = cv2.resize(gray_image, (width // scale, height // scale), interpolation=cv2.INTER_AREA)
+    bboxs, ids, _ = get_aruco_detector(preset).detectMarkers(small_image)
+    if ids is None:
+        return bboxs, ids
+
+    # Llevar las esquinas a resolución completa (coordenadas referidas al centro del píxel)
+    scale_x = width / small_image.shape[1]
+    scale_y = height / small_image.shape[0]
+    corners = np.concatenate([bbox.reshape(4, 2) for bbox in bboxs]).astype(np.float32)
+    corners[:, 0] = (corners[:, 0] + 0.5) * scale_x - 0.5
+    corners[:, 1] = (corners[:, 1] + 0.5) * scale_y - 0.5
+
+    # Refinar cada marcador por separado: la ventana no debe superar 3/4 de módulo del marcador
+    # para no engancharse a las esquinas interiores del patrón de bits
+    modules = get_aruco_detector(preset).getDictionary().markerSize + 2
+    max_shift = float(pyramid_refine_window(pyramid_levels))
+    criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, ARUCO_PYRAMID_REFINE_ITERATIONS, 0.01)
+    refined: List[np.ndarray] = []
+    for idx in range(len(bboxs)):
+        coarse = corners[idx * 4:idx * 4 + 4]
+        side = float(np.mean(np.linalg.norm(coarse - np.roll(coarse, 1, axis=0), axis=1)))
+        window = int(min(pyramid_refine_window(pyramid_levels), max(2.0, side / modules * 0.75)))
+        fine = coarse.copy()
+        cv2.cornerSubPix(gray_image, fine, (window, window), (-1, -1), criteria)
+        # Si el refinamiento se aleja más que el error del nivel reducido, conservar la esquina gruesa
+        shift = np.linalg.norm(fine - coarse, axis=1)
+        fine[shift > max_shift] = coarse[shift > max_shift]
+        refined.append(fine.reshape(1, 4, 2))
+
+    return tuple(refined), ids
+
+
+def detect_markers(
+    gray_image: np.ndarray,
+    pyramid_levels: int = 0,
+    preset: str = ARUCO_DETECTOR_PRESET
+) -> Tuple[List[Any], Any]:
+    """
+    Detecta los marcadores en una imagen en escala de grises, a resolución completa o en pirámide.
+
+    Args:
+        gray_image (np.ndarray): Imagen en escala de grises.
+        pyramid_levels (int): Niveles de reducción (0 detecta a resolución completa).
+        preset (str): Preset de ``DetectorParameters``.
+
+    Returns:
+        Tuple[List[Any], Any]: Esquinas e IDs de los marcadores detectados.
+    """
+    if pyramid_levels > 0:
+        return detect_markers_pyramid(gray_image, pyramid_levels, preset)
+    bboxs, ids, _ = get_aruco_detector(preset).detectMarkers(gray_image)
+    return bboxs, ids
+
+
+@lru_cache(maxsize=None)
+def get_tile_executor(workers: int) -> ThreadPoolExecutor:
+    """
+    Devuelve el pool de hilos para la detección por teselas. OpenCV libera el GIL durante la
+    detección, por lo que los hilos procesan las teselas en paralelo.
+
+    Args:
+        workers (int): Número de hilos (0 usa el número de núcleos).
+
+    Returns:
+        ThreadPoolExecutor: Pool de hilos reutilizado entre frames.
+    """
+    return ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1, thread_name_prefix="aruco-tile")
+
+
+def compute_tiles(width: int, height: int, grid: Tuple[int, int], overlap: int) -> List[Tuple[int, int, int, int]]:
+    """
+    Divide la imagen en una rejilla de teselas solapadas.
+
+    Args:
+        width (int): Ancho de la imagen.
+        height (int): Alto de la imagen.
+        grid (Tuple[int, int]): Filas y columnas de la rejilla.
+        overlap (int): Solapamiento entre teselas vecinas en píxeles; debe superar la caja
+            envolvente del mayor marcador esperado para que cada marcador quede entero en alguna
+            tesela (un marcador cortado por el borde puede detectarse con esquinas erróneas).
+
+    Returns:
+        List[Tuple[int, int, int, int]]: Teselas como (x0, y0, x1, y1).
+    """
+    rows, cols = grid
+    tiles: List[Tuple[int, int, int, int]] = []
+    for row in range(rows):
+        y0 = max(0, row * height // rows - overlap // 2)
+        y1 = min(height, (row + 1) * height // rows + overlap // 2)
+        for col in range(cols):
+            x0 = max(0, col * width // cols - overlap // 2)
+            x1 = min(width, (col + 1) * width // cols + overlap // 2)
+            tiles.append((x0, y0, x1, y1))
+    return tiles
+
+
+def deduplicate_markers(
+    candidates: List[Tuple[np.ndarray, int, float]]
+) -> Tuple[List[np.ndarray], Optional[np.ndarray]]:
+    """
+    Elimina los marcadores detectados en más de una tesela. Dos detecciones son el mismo marcador
+    si tienen el mismo ID y sus centros distan menos de la mitad del lado del marcador; se conserva
+    la detección más alejada del borde de su tesela.
+
+    Args:
+        candidates (List[Tuple[np.ndarray, int, float]]): Esquinas (1x4x2), ID y distancia al
+            borde de la tesela de cada detección.
+
+    Returns:
+        Tuple[List[np.ndarray], Optional[np.ndarray]]: Esquinas e IDs (Nx1) sin duplicados.
+    """
+    kept: List[Tuple[np.ndarray, int, float]] = []
+    for corners, marker_id, margin in sorted(candidates, key=lambda candidate: -candidate[2]):
+        center = corners.reshape(4, 2).mean(axis=0)
+        side = float(np.mean(np.linalg.norm(corners.reshape(4, 2) - np.roll(corners.reshape(4, 2), 1, axis=0), axis=1)))
+        duplicate = any(
+            kept_id == marker_id and np.linalg.norm(kept_corners.reshape(4, 2).mean(axis=0) - center) < side / 2
+            for kept_corners, kept_id, _ in kept
+        )
+        if not duplicate:
+            kept.append((corners, marker_id, margin))
+
+    if not kept:
+        return [], None
+    return [corners for corners, _, _ in kept], np.array([[marker_id] for _, marker_id, _ in kept], dtype=np.int32)
+
+
+def detect_markers_tiled(
+    gray_image: np.ndarray,
+    grid: Tuple[int, int] = ARUCO_TILE_GRID,
+    overlap: int = ARUCO_TILE_OVERLAP,
+    workers: int = ARUCO_TILE_WORKERS,
+    pyramid_levels: int = 0,
+    preset: str = ARUCO_DETECTOR_PRESET
+) -> Tuple[List[Any], Any]:
+    """
+    Detecta los marcadores dividiendo la imagen en teselas solapadas que se procesan en paralelo
+    y combinando los resultados sin duplicados.
+
+    Args:
+        gray_image (np.ndarray): Imagen en escala de grises.
+        grid (Tuple[int, int]): Filas y columnas de la rejilla de teselas.
+        overlap (int): Solapamiento entre teselas en píxeles.
+        workers (int): Número de hilos (0 usa el número de núcleos).
+        pyramid_levels (int): Niveles de reducción aplicados dentro de cada tesela.
+        preset (str): Preset de ``DetectorParameters``.
+
+    Returns:
+        Tuple[List[Any], Any]: Esquinas e IDs de los marcadores detectados.
+    """
+    height, width = gray_image.shape[:2]
+    tiles = compute_tiles(width, height, grid, overlap)
+
+    def detect_tile(tile: Tuple[int, int, int, int]) -> List[Tuple[np.ndarray, int, float]]:
+        x0, y0, x1, y1 = tile
+        bboxs, ids = detect_markers(gray_image[y0:y1, x0:x1], pyramid_levels, preset)
+        results: List[Tuple[np.ndarray, int, float]] = []
+        if ids is None:
+            return results
+        for bbox, marker_id in zip(bboxs, ids.reshape(-1)):
+            local = bbox.reshape(4, 2)
+            # Distancia del marcador al borde interior de la tesela (los bordes de la imagen no cuentan)
+            margins = [
+                local[:, 0].min() if x0 > 0 else np.inf,
+                local[:, 1].min() if y0 > 0 else np.inf,
+                (x1 - x0 - 1) - local[:, 0].max() if x1 < width else np.inf,
+                (y1 - y0 - 1) - local[:, 1].max() if y1 < height else np.inf,
+            ]
+            corners = (local + np.float32([x0, y0])).reshape(1, 4, 2).astype(np.float32)
+            results.append((corners, int(marker_id), float(min(margins))))
+        return results
+
+    candidates: List[Tuple[np.ndarray, int, float]] = []
+    for tile_results in get_tile_executor(workers).map(detect_tile, tiles):
+        candidates.extend(tile_results)
+
+    bboxs, ids = deduplicate_markers(candidates)
+    return tuple(bboxs), ids
+
+
 def find_aruco_markers(
     image: np.ndarray,
     marker_size: int = ARUCO_MARKER_SIZE,
     total_markers: int = ARUCO_TOTAL_MARKERS,
-    draw: bool = True
+    draw: bool = True,
+    pyramid_levels: int = ARUCO_PYRAMID_LEVELS,
+    tile_grid: Tuple[int, int] = ARUCO_TILE_GRID,
+    preset: str = ARUCO_DETECTOR_PRESET
 ) -> Tuple[List[Any], List[Any]]:
     """
     Detecta los marcadores ArUco en la imagen.
@@ -56,6 +313,11 @@ def find_aruco_markers(
         marker_size (int): Tamaño del marcador.
         total_markers (int): Número total de marcadores en el diccionario.
         draw (bool): Flag para dibujar el contorno de los marcadores.
+        pyramid_levels (int): Niveles de reducción para la detección de grueso a fino
+            (0 detecta a resolución completa).
+        tile_grid (Tuple[int, int]): Filas y columnas para la detección en paralelo por teselas
+            ((1, 1) detecta la imagen completa de una vez).
+        preset (str): Preset de ``DetectorParameters`` ("default" o uno de ``ARUCO_PRESETS_PATH``).
 
     Returns:
         Tuple[List[Any], List[Any]]: Lista de contornos (bboxes) y IDs de marcadores detectados.
@@ -65,14 +327,10 @@ def find_aruco_markers(
     except Exception as e:
         raise ValueError(f"Error al convertir la imagen a escala de grises: {e}")
 
-    # Crear el diccionario de ArUco
-    aruco_dictionary = aruco.getPredefinedDictionary(ARUCO_DICT)
-    aruco_parameters = aruco.DetectorParameters()
-
-    # Crear el detector de ArUco
-    detector = aruco.ArucoDetector(aruco_dictionary, aruco_parameters)
-
-    bboxs, ids, _ = detector.detectMarkers(gray_image)
+    if tile_grid[0] * tile_grid[1] > 1:
+        bboxs, ids = detect_markers_tiled(gray_image, grid=tile_grid, pyramid_levels=pyramid_levels, preset=preset)
+    else:
+        bboxs, ids = detect_markers(gray_image, pyramid_levels, preset)
 
     if draw and bboxs:
         aruco.drawDetectedMarkers(image, bboxs)
@@ -80,6 +338,86 @@ def find_aruco_markers(
     return bboxs, ids
 
 
+def warp_overlay(
+    corners: np.ndarray,
+    augmented_image: np.ndarray,
+    frame_shape: Tuple[int, ...]
+) -> Optional[Tuple[Tuple[int, int], np.ndarray]]:
+    """
+    Deforma la imagen aumentada sobre el marcador, solo en el rectángulo que ocupa dentro del frame
+    (y no en un lienzo del tamaño del frame completo).
+
+    Args:
+        corners (np.ndarray): Esquinas del marcador (4x2), en el orden de detección.
+        augmented_image (np.ndarray): Imagen de aumento.
+        frame_shape (Tuple[int, ...]): Dimensiones del frame de destino.
+
+    Returns:
+        Optional[Tuple[Tuple[int, int], np.ndarray]]: Origen (x, y) del rectángulo en el frame y la
+        imagen deformada, o None si el marcador queda fuera del frame.
+    """
+    try:
+        h_aug, w_aug, _ = augmented_image.shape
+    except Exception as e:
+        raise ValueError(f"Error al obtener las dimensiones de la imagen aumentada: {e}")
+
+    frame_height, frame_width = frame_shape[:2]
+    x0 = max(int(np.floor(corners[:, 0].min())), 0)
+    y0 = max(int(np.floor(corners[:, 1].min())), 0)
+    x1 = min(int(np.ceil(corners[:, 0].max())) + 1, frame_width)
+    y1 = min(int(np.ceil(corners[:, 1].max())) + 1, frame_height)
+    if x1 <= x0 or y1 <= y0:
+        return None
+
+    pts_src = np.float32([[0, 0], [w_aug, 0], [w_aug, h_aug], [0, h_aug]])
+    matrix, _ = cv2.findHomography(pts_src, corners - np.float32([x0, y0]))
+    if matrix is None:
+        return None
+    patch = cv2.warpPerspective(augmented_image, matrix, (x1 - x0, y1 - y0))
+    return (x0, y0), patch
+
+
+def composite_overlay(image: np.ndarray, corners: np.ndarray, origin: Tuple[int, int], patch: np.ndarray) -> None:
+    """
+    Superpone (en el sitio) una imagen deformada con ``warp_overlay`` sobre el marcador.
+
+    Args:
+        image (np.ndarray): Imagen base.
+        corners (np.ndarray): Esquinas del marcador (4x2).
+        origin (Tuple[int, int]): Origen (x, y) del rectángulo deformado.
+        patch (np.ndarray): Imagen deformada.
+    """
+    # Rellenar el marcador detectado con negro para evitar superposición
+    cv2.fillConvexPoly(image, corners.astype(int), (0, 0, 0))
+    # Recortar al frame (un rectángulo reutilizado y desplazado puede salirse)
+    x0, y0 = origin
+    left, top = max(x0, 0), max(y0, 0)
+    right, bottom = min(x0 + patch.shape[1], image.shape[1]), min(y0 + patch.shape[0], image.shape[0])
+    if right <= left or bottom <= top:
+        return
+    image[top:bottom, left:right] += patch[top - y0:bottom - y0, left - x0:right - x0]
+
+
+def draw_marker_id(image: np.ndarray, corners: np.ndarray, marker_id: int) -> None:
+    """
+    Dibuja el ID del marcador junto a su primera esquina.
+
+    Args:
+        image (np.ndarray): Imagen sobre la que dibujar.
+        corners (np.ndarray): Esquinas del marcador (4x2).
+        marker_id (int): ID del marcador.
+    """
+    cv2.putText(
+        image,
+        str(int(marker_id)),
+        (int(corners[0][0]), int(corners[0][1])),
+        cv2.FONT_HERSHEY_PLAIN,
+        2,
+        (255, 0, 0),
+        3
+    )
+
+
 def augment_aruco(
     bbox: Any,
     marker_id: int,
@@ -101,35 +439,14 @@ def augment_aruco(
         np.ndarray: Imagen con la superposición realizada.
     """
     # Extraer las coordenadas de las esquinas del marcador
-    top_left = (bbox[0][0][0], bbox[0][0][1])
-    top_right = (bbox[0][1][0], bbox[0][1][1])
-    bottom_right = (bbox[0][2][0], bbox[0][2][1])
-    bottom_left = (bbox[0][3][0], bbox[0][3][1])
-
-    try:
-        h_aug, w_aug, _ = augmented_image.shape
-    except Exception as e:
-        raise ValueError(f"Error al obtener las dimensiones de la imagen aumentada: {e}")
-
-    pts_dst = np.array([top_left, top_right, bottom_right, bottom_left])
-    pts_src = np.float32([[0, 0], [w_aug, 0], [w_aug, h_aug], [0, h_aug]])
+    corners = np.asarray(bbox, dtype=np.float32).reshape(4, 2)
 
-    matrix, _ = cv2.findHomography(pts_src, pts_dst)
-    img_warp = cv2.warpPerspective(augmented_image, matrix, (image.shape[1], image.shape[0]))
-
-    # Rellenar el marcador detectado con negro para evitar superposición
-    cv2.fillConvexPoly(image, pts_dst.astype(int), (0, 0, 0))
-    img_out = image + img_warp
+    warped = warp_overlay(corners, augmented_image, image.shape)
+    if warped is None:
+        return image
+    composite_overlay(image, corners, *warped)
 
     if draw_id:
-        cv2.putText(
-            img_out,
-            str(int(marker_id)),
-            (int(bbox[0][0][0]), int(bbox[0][0][1])),
-            cv2.FONT_HERSHEY_PLAIN,
-            2,
-            (255, 0, 0),
-            3
-        )
+        draw_marker_id(image, corners, marker_id)
 
-    return img_out
+    return image
@@ -0,0 +1,116 @@
+"""
+Benchmark del bus de frames: un proceso publica frames lo más rápido posible y el proceso
+principal los consume con ``FrameBusSubscriber.next``, sin copia y con copia.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_frame_bus
+    python -m benchmarks.bench_frame_bus --resolutions 800x600 1920x1080 3840x2160 --duration 5
+"""
+
+import time
+import uuid
+import argparse
+import multiprocessing
+import numpy as np
+from typing import Any, Dict, List, Tuple
+
+from frame_bus import FrameBusPublisher, FrameBusSubscriber
+
+
+def publisher_process(name: str, width: int, height: int, slots: int, duration: float, ready: Any, stats: Any) -> None:
+    """
+    Publica frames (con metadatos de tamaño típico) durante ``duration`` segundos.
+    """
+    publisher = FrameBusPublisher(name, width, height, slots=slots)
+    frames = [np.full((height, width, 3), value, dtype=np.uint8) for value in range(4)]
+    metadata = {
+        "frame_index": 0,
+        "markers": [{"id": marker_id, "corners": [[10.0, 10.0], [60.0, 10.0], [60.0, 60.0], [10.0, 60.0]]}
+                    for marker_id in range(4)],
+        "hands": [[idx, 100 + idx, 200 + idx] for idx in range(21)],
+    }
+    ready.set()
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        metadata["frame_index"] = count
+        publisher.publish(frames[count % len(frames)], metadata)
+        count += 1
+    stats.put((count, time.perf_counter() - start))
+    # Dar tiempo al consumidor para leer las últimas ranuras antes de eliminar el bloque
+    time.sleep(0.5)
+    publisher.close()
+
+
+def run_case(width: int, height: int, slots: int, duration: float, copy: bool) -> Dict[str, Any]:
+    """
+    Ejecuta un caso del benchmark y devuelve sus métricas.
+    """
+    name = f"bench_bus_{uuid.uuid4().hex[:8]}"
+    context = multiprocessing.get_context("spawn")
+    ready, stats = context.Event(), context.Queue()
+    process = context.Process(target=publisher_process, args=(name, width, height, slots, duration, ready, stats))
+    process.start()
+    ready.wait()
+
+    subscriber = FrameBusSubscriber(name)
+    received, torn = 0, 0
+    latencies: List[float] = []
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        bus_frame = subscriber.next(timeout=0.5, copy=copy)
+        if bus_frame is None:
+            continue
+        # Trabajo mínimo del consumidor: tocar un píxel del frame
+        _ = int(bus_frame.frame[0, 0, 0])
+        latencies.append(time.time() - bus_frame.timestamp)
+        if not copy and not bus_frame.is_valid():
+            torn += 1
+        received += 1
+        del bus_frame
+    elapsed = time.perf_counter() - start
+    dropped = subscriber.dropped
+    subscriber.close()
+
+    published, publish_time = stats.get()
+    process.join()
+    latencies_ms = np.asarray(latencies) * 1000.0
+    frame_bytes = width * height * 3
+    return {
+        "resolution": f"{width}x{height}",
+        "mode": "copia" if copy else "sin copia",
+        "publish_fps": published / publish_time,
+        "publish_gbps": published * frame_bytes / publish_time / 1e9,
+        "consume_fps": received / elapsed,
+        "dropped": dropped,
+        "torn": torn,
+        "latency_p50_ms": float(np.percentile(latencies_ms, 50)) if received else 0.0,
+        "latency_p95_ms": float(np.percentile(latencies_ms, 95)) if received else 0.0,
+    }
+
+
+def parse_resolution(value: str) -> Tuple[int, int]:
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark del bus de frames en memoria compartida.")
+    parser.add_argument("--resolutions", nargs="+", default=["800x600", "1920x1080"])
+    parser.add_argument("--slots", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=3.0)
+    args = parser.parse_args()
+
+    print(f"{'resolución':>10} {'modo':>10} {'pub fps':>9} {'pub GB/s':>9} {'cons fps':>9} "
+          f"{'perdidos':>9} {'invalid.':>9} {'lat p50':>9} {'lat p95':>9}")
+    for resolution in args.resolutions:
+        width, height = parse_resolution(resolution)
+        for copy in (False, True):
+            result = run_case(width, height, args.slots, args.duration, copy)
+            print(f"{result['resolution']:>10} {result['mode']:>10} {result['publish_fps']:>9.0f} "
+                  f"{result['publish_gbps']:>9.2f} {result['consume_fps']:>9.0f} {result['dropped']:>9} "
+                  f"{result['torn']:>9} {result['latency_p50_ms']:>7.2f}ms {result['latency_p95_ms']:>7.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Benchmark de superposiciones animadas: N marcadores con un video cada uno, procesados por
+``ARPipeline`` a un FPS objetivo.
+
+Compara tres casos sobre la misma escena sintética:
+    - estático: una imagen fija por marcador (referencia, sin decodificación);
+    - síncrono: el video se decodifica dentro del bucle de frames, cuando toca el siguiente frame;
+    - anticipado: ``VideoMediaSource`` decodifica en hilos de fondo y el bucle solo toma el frame.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_media_overlays
+    python -m benchmarks.bench_media_overlays --markers 10 --target-fps 30 --clip-resolution 1920x1080
+"""
+
+import os
+import time
+import shutil
+import argparse
+import tempfile
+import cv2
+import numpy as np
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from ar_pipeline import ARPipeline
+from media_source import MediaSource, VideoMediaSource
+from synthetic_scene import render_marker_scene
+from constants import MEDIA_MAX_SIDE
+
+
+class SyncMediaSource(MediaSource):
+    """
+    Fuente de referencia que decodifica en el hilo del llamador un frame por llamada (lo que haría
+    un ``cap.read()`` dentro del bucle principal).
+    """
+
+    def __init__(self, path: str, max_side: int = MEDIA_MAX_SIDE) -> None:
+        self.path = path
+        self.max_side = max_side
+        self.capture = cv2.VideoCapture(path)
+        self.current: Optional[np.ndarray] = None
+        self._read()
+
+    def _read(self) -> None:
+        ret, frame = self.capture.read()
+        if not ret:
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.capture.read()
+        height, width = frame.shape[:2]
+        scale = self.max_side / max(height, width)
+        if scale < 1.0:
+            frame = cv2.resize(frame, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+        self.current = frame
+
+    def current_frame(self) -> Optional[np.ndarray]:
+        self._read()
+        return self.current
+
+    def close(self) -> None:
+        self.capture.release()
+
+
+class CountingMediaSource(MediaSource):
+    """
+    Envoltorio que cuenta los frames distintos servidos por una fuente (la cadencia real del
+    contenido que se ve sobre el marcador).
+    """
+
+    def __init__(self, source: MediaSource) -> None:
+        self.source = source
+        self.last: Optional[np.ndarray] = None
+        self.distinct_frames: int = 0
+
+    def current_frame(self) -> Optional[np.ndarray]:
+        frame = self.source.current_frame()
+        if frame is not None and frame is not self.last:
+            self.distinct_frames += 1
+            self.last = frame
+        return frame
+
+    def set_visible(self, visible: bool) -> None:
+        self.source.set_visible(visible)
+
+    def close(self) -> None:
+        self.source.close()
+
+
+def write_clips(folder: str, marker_ids: List[int], resolution: Tuple[int, int], num_frames: int, fps: float) -> None:
+    """
+    Escribe un clip MJPG por marcador con contenido en movimiento (gradiente desplazado y ruido).
+    """
+    width, height = resolution
+    rng = np.random.default_rng(0)
+    noise = rng.integers(0, 40, size=(height, width, 3), dtype=np.uint8)
+    base = np.tile(np.linspace(0, 215, width, dtype=np.uint8), (height, 1))
+    for marker_id in marker_ids:
+        writer = cv2.VideoWriter(os.path.join(folder, f"{marker_id}.avi"), cv2.VideoWriter_fourcc(*"MJPG"), fps, (width, height))
+        for index in range(num_frames):
+            shifted = np.roll(base, index * 8 + marker_id * 50, axis=1)
+            frame = cv2.merge([shifted, np.roll(shifted, width // 3, axis=1), np.full_like(shifted, 20 * marker_id)])
+            writer.write(cv2.add(frame, noise))
+        writer.release()
+
+
+def run_case(
+    scene: np.ndarray,
+    augmented_images: Mapping[int, np.ndarray],
+    media_sources: Mapping[int, MediaSource],
+    target_fps: float,
+    duration: float
+) -> Dict[str, Any]:
+    """
+    Procesa la escena a ``target_fps`` durante ``duration`` segundos y mide el tiempo por frame y
+    cuántos frames distintos de video se ven por segundo en cada marcador.
+    """
+    media_sources = {marker_id: CountingMediaSource(source) for marker_id, source in media_sources.items()}
+    pipeline = ARPipeline(augmented_images, enable_hand_detection=False, show_rectangles=False, media_sources=media_sources)
+    pipeline.process(scene.copy())  # Calentamiento (creación del detector)
+    frame_budget = 1.0 / target_fps
+    frame_times: List[float] = []
+    start = time.perf_counter()
+    next_deadline = start
+    while time.perf_counter() - start < duration:
+        frame_start = time.perf_counter()
+        pipeline.process(scene.copy())
+        frame_times.append(time.perf_counter() - frame_start)
+        # Mantener el ritmo de una cámara a target_fps
+        next_deadline += frame_budget
+        remaining = next_deadline - time.perf_counter()
+        if remaining > 0:
+            time.sleep(remaining)
+        else:
+            next_deadline = time.perf_counter()
+    elapsed = time.perf_counter() - start
+    frame_times_ms = np.asarray(frame_times) * 1000.0
+    content_fps = [source.distinct_frames / elapsed for source in media_sources.values()]
+    return {
+        "fps": len(frame_times) / elapsed,
+        "content_fps": float(np.mean(content_fps)) if content_fps else 0.0,
+        "p50_ms": float(np.percentile(frame_times_ms, 50)),
+        "p95_ms": float(np.percentile(frame_times_ms, 95)),
+        "over_budget": float(np.mean(frame_times_ms > frame_budget * 1000.0)) * 100.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de superposiciones animadas con decodificación anticipada.")
+    parser.add_argument("--markers", type=int, default=10)
+    parser.add_argument("--resolution", default="800x600")
+    parser.add_argument("--clip-resolution", default="1280x720")
+    parser.add_argument("--clip-fps", type=float, default=30.0)
+    parser.add_argument("--target-fps", type=float, default=30.0)
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    width, height = (int(value) for value in args.resolution.lower().split("x"))
+    clip_resolution = tuple(int(value) for value in args.clip_resolution.lower().split("x"))
+    marker_ids = list(range(args.markers))
+    scene, corners = render_marker_scene(width, height, marker_ids, marker_size_range=(70, 110), seed=0)
+    if len(corners) < len(marker_ids):
+        print(f"Aviso: solo caben {len(corners)} de {len(marker_ids)} marcadores en la escena.")
+
+    folder = tempfile.mkdtemp(prefix="bench_media_")
+    try:
+        write_clips(folder, marker_ids, clip_resolution, num_frames=int(args.clip_fps * 3), fps=args.clip_fps)
+        paths = {marker_id: os.path.join(folder, f"{marker_id}.avi") for marker_id in marker_ids}
+        static_images = {marker_id: SyncMediaSource(path).current for marker_id, path in paths.items()}
+
+        print(f"{args.markers} marcadores animados, escena {args.resolution}, clips {args.clip_resolution} "
+              f"a {args.clip_fps:g} FPS, objetivo {args.target_fps:g} FPS")
+        print(f"{'caso':>11} {'FPS':>7} {'p50':>9} {'p95':>9} {'> presup.':>10} {'video FPS':>10}")
+        cases = [
+            ("estático", lambda: {}),
+            ("síncrono", lambda: {marker_id: SyncMediaSource(path) for marker_id, path in paths.items()}),
+            ("anticipado", lambda: {marker_id: VideoMediaSource(path) for marker_id, path in paths.items()}),
+        ]
+        for name, build_sources in cases:
+            media_sources = build_sources()
+            try:
+                result = run_case(scene, static_images, media_sources, args.target_fps, args.duration)
+            finally:
+                for media_source in media_sources.values():
+                    media_source.close()
+            print(f"{name:>11} {result['fps']:>7.1f} {result['p50_ms']:>7.2f}ms {result['p95_ms']:>7.2f}ms "
+                  f"{result['over_budget']:>9.1f}% {result['content_fps']:>10.1f}")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
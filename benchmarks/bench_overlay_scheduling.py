@@ -0,0 +1,106 @@
+"""
+Benchmark del planificador de superposiciones en escenas con muchos marcadores.
+
+Mide el tiempo de composición por frame (sin detección) con ``augment_aruco`` para cada marcador
+frente a ``OverlayScheduler``, para un número creciente de marcadores. Los marcadores se colocan a
+distancias aleatorias (la mayoría lejanos y pequeños, algunos cortados por el borde) y se mueven
+``--motion`` píxeles por frame como máximo, para incluir escenas quietas y en movimiento.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_overlay_scheduling
+    python -m benchmarks.bench_overlay_scheduling --resolution 1920x1080 --counts 10 50 100 200 --motion 0 3
+"""
+
+import time
+import argparse
+import numpy as np
+from typing import Any, Dict, List, Tuple
+
+from augment_markers import augment_aruco
+from overlay_scheduler import OverlayScheduler
+
+
+def crowded_markers(count: int, width: int, height: int, rng: np.random.Generator) -> List[Tuple[int, np.ndarray]]:
+    """
+    Genera ``count`` marcadores con lado inversamente proporcional a una distancia aleatoria.
+    """
+    markers = []
+    for marker_id in range(count):
+        side = 400.0 / rng.uniform(1.0, 25.0)
+        center = rng.uniform((-side / 2, -side / 2), (width + side / 2, height + side / 2))
+        angle = rng.uniform(-np.pi / 6, np.pi / 6)
+        rotation = np.array([[np.cos(angle), -np.sin(angle)], [np.sin(angle), np.cos(angle)]])
+        half = side / 2
+        square = np.array([[-half, -half], [half, -half], [half, half], [-half, half]])
+        jitter = rng.uniform(-0.05, 0.05, (4, 2)) * side
+        markers.append((marker_id, (square @ rotation.T + center + jitter).astype(np.float32)))
+    return markers
+
+
+def run_case(
+    background: np.ndarray,
+    markers: List[Tuple[int, np.ndarray]],
+    contents: Dict[int, np.ndarray],
+    scheduled: bool,
+    motion: float,
+    frames: int
+) -> Dict[str, Any]:
+    """
+    Compone ``frames`` frames y devuelve el tiempo medio y p95 por frame.
+    """
+    rng = np.random.default_rng(1)
+    scheduler = OverlayScheduler()
+    markers = [(marker_id, corners.copy()) for marker_id, corners in markers]
+    frame_times: List[float] = []
+    actions: Dict[str, int] = {}
+    for _ in range(frames):
+        if motion > 0:
+            for _, corners in markers:
+                corners += rng.uniform(-motion, motion, 2).astype(np.float32)
+        frame = background.copy()
+        start = time.perf_counter()
+        if scheduled:
+            scheduler.composite(frame, markers, contents.get)
+        else:
+            for marker_id, corners in markers:
+                frame = augment_aruco(corners[np.newaxis], marker_id, frame, contents[marker_id])
+        frame_times.append(time.perf_counter() - start)
+        for decision in scheduler.last_decisions:
+            actions[decision.action] = actions.get(decision.action, 0) + 1
+    frame_times_ms = np.asarray(frame_times[1:]) * 1000.0
+    return {
+        "mean_ms": float(frame_times_ms.mean()),
+        "p95_ms": float(np.percentile(frame_times_ms, 95)),
+        "actions": {action: count / frames for action, count in sorted(actions.items())},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark del planificador de superposiciones por tamaño de marcador.")
+    parser.add_argument("--resolution", default="1280x720")
+    parser.add_argument("--counts", nargs="+", type=int, default=[5, 10, 20, 40, 80, 160])
+    parser.add_argument("--motion", nargs="+", type=float, default=[0.0, 2.0])
+    parser.add_argument("--content-side", type=int, default=512)
+    parser.add_argument("--frames", type=int, default=30)
+    args = parser.parse_args()
+
+    width, height = (int(value) for value in args.resolution.lower().split("x"))
+    rng = np.random.default_rng(0)
+    background = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    content = rng.integers(0, 256, (args.content_side, args.content_side, 3), dtype=np.uint8)
+
+    print(f"Escena {args.resolution}, contenido {args.content_side}x{args.content_side}, {args.frames} frames por caso")
+    print(f"{'marcadores':>10} {'mov. px':>8} {'completo':>10} {'p95':>9} {'planif.':>9} {'p95':>9}  acciones por frame")
+    for motion in args.motion:
+        for count in args.counts:
+            markers = crowded_markers(count, width, height, np.random.default_rng(count))
+            contents = {marker_id: content for marker_id, _ in markers}
+            full = run_case(background, markers, contents, False, motion, args.frames)
+            scheduled = run_case(background, markers, contents, True, motion, args.frames)
+            actions = ", ".join(f"{action} {value:.1f}" for action, value in scheduled["actions"].items())
+            print(f"{count:>10} {motion:>8g} {full['mean_ms']:>8.2f}ms {full['p95_ms']:>7.2f}ms "
+                  f"{scheduled['mean_ms']:>7.2f}ms {scheduled['p95_ms']:>7.2f}ms  {actions}")
+
+
+if __name__ == "__main__":
+    main()
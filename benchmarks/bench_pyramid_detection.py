@@ -0,0 +1,84 @@
+"""
+Benchmark de la detección de grueso a fino (pirámide) frente a la detección a resolución completa.
+
+Para cada resolución y nivel de pirámide mide, sobre escenas sintéticas con esquinas conocidas:
+tiempo de detección, recall, error máximo de las esquinas y el lado mínimo de marcador
+detectable (recall >= 95 %).
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_pyramid_detection
+    python -m benchmarks.bench_pyramid_detection --resolutions 1920x1080 3840x2160 --levels 0 1 2 3
+"""
+
+import time
+import argparse
+import numpy as np
+from typing import Dict, Sequence, Tuple
+
+from augment_markers import find_aruco_markers
+from synthetic_scene import render_marker_scene
+
+MARKER_SIDES: Tuple[int, ...] = (16, 20, 24, 32, 40, 48, 56, 64, 80, 96, 128, 160, 192, 256)
+
+
+def evaluate(width: int, height: int, level: int, size_range: Tuple[int, int], scenes: int,
+             noise_sigma: float = 2.0) -> Dict[str, float]:
+    """
+    Detecta marcadores en ``scenes`` escenas sintéticas y compara con las esquinas reales.
+    """
+    found, total, elapsed = 0, 0, 0.0
+    errors = []
+    for seed in range(scenes):
+        frame, corners = render_marker_scene(width, height, list(range(10)), marker_size_range=size_range,
+                                             noise_sigma=noise_sigma, seed=seed)
+        start = time.perf_counter()
+        bboxes, ids = find_aruco_markers(frame, draw=False, pyramid_levels=level)
+        elapsed += time.perf_counter() - start
+        total += len(corners)
+        if ids is None:
+            continue
+        for bbox, marker_id in zip(bboxes, ids.reshape(-1)):
+            if int(marker_id) in corners:
+                found += 1
+                errors.append(np.linalg.norm(bbox.reshape(4, 2) - corners[int(marker_id)], axis=1).max())
+    return {
+        "recall": found / total,
+        "max_error": float(max(errors)) if errors else float("nan"),
+        "time_ms": elapsed / scenes * 1000.0,
+    }
+
+
+def min_detectable_side(width: int, height: int, level: int, sides: Sequence[int], scenes: int) -> int:
+    """
+    Devuelve el menor lado (px a resolución completa) a partir del cual el recall es >= 95 %.
+    """
+    minimum = 0
+    for side in reversed(sides):
+        # El marcador (con su celda) debe caber en la escena
+        if side * 1.6 > min(width, height):
+            continue
+        if evaluate(width, height, level, (side, side), scenes)["recall"] < 0.95:
+            break
+        minimum = side
+    return minimum
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de la detección ArUco en pirámide.")
+    parser.add_argument("--resolutions", nargs="+", default=["1920x1080", "3840x2160"])
+    parser.add_argument("--levels", nargs="+", type=int, default=[0, 1, 2, 3])
+    parser.add_argument("--scenes", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{'resolución':>10} {'nivel':>5} {'tiempo':>9} {'recall':>7} {'error máx':>10} {'lado mín':>9}")
+    for resolution in args.resolutions:
+        width, height = (int(value) for value in resolution.lower().split("x"))
+        for level in args.levels:
+            result = evaluate(width, height, level, (120, 200), args.scenes)
+            minimum = min_detectable_side(width, height, level, MARKER_SIDES, args.scenes)
+            print(f"{resolution:>10} {level:>5} {result['time_ms']:>7.1f}ms {result['recall']:>7.2f} "
+                  f"{result['max_error']:>8.2f}px {minimum:>7}px")
+
+
+if __name__ == "__main__":
+    main()
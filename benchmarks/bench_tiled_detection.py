@@ -0,0 +1,77 @@
+"""
+Benchmark de la detección por teselas en paralelo frente a una única llamada a ``detectMarkers``.
+
+Para cada rejilla y número de hilos mide el tiempo medio de detección sobre escenas sintéticas
+y comprueba que el resultado coincide con la detección del frame completo (mismos IDs y esquinas).
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_tiled_detection
+    python -m benchmarks.bench_tiled_detection --resolution 3840x2160 --grids 2x2 3x3 --workers 1 2 4 8
+"""
+
+import os
+import time
+import argparse
+import cv2
+import numpy as np
+from typing import Any, Dict, List, Tuple
+
+from augment_markers import detect_markers, detect_markers_tiled
+from synthetic_scene import render_marker_scene
+
+
+def as_dict(bboxes: Any, ids: Any) -> Dict[int, np.ndarray]:
+    if ids is None:
+        return {}
+    return {int(marker_id): bbox.reshape(4, 2) for bbox, marker_id in zip(bboxes, ids.reshape(-1))}
+
+
+def results_match(reference: Dict[int, np.ndarray], result: Dict[int, np.ndarray], tolerance: float = 0.5) -> bool:
+    if set(reference) != set(result):
+        return False
+    return all(np.abs(reference[marker_id] - result[marker_id]).max() <= tolerance for marker_id in reference)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de la detección ArUco por teselas.")
+    parser.add_argument("--resolution", default="3840x2160")
+    parser.add_argument("--grids", nargs="+", default=["2x2", "3x3", "4x4"])
+    parser.add_argument("--workers", nargs="+", type=int, default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument("--markers", type=int, default=40)
+    parser.add_argument("--scenes", type=int, default=5)
+    parser.add_argument("--overlap", type=int, default=320)
+    parser.add_argument("--opencv-threads", type=int, default=-1,
+                        help="Hilos internos de OpenCV (-1 deja el valor por defecto; 1 aísla el paralelismo por teselas).")
+    args = parser.parse_args()
+
+    if args.opencv_threads >= 0:
+        cv2.setNumThreads(args.opencv_threads)
+    width, height = (int(value) for value in args.resolution.lower().split("x"))
+    scenes: List[np.ndarray] = []
+    for seed in range(args.scenes):
+        frame, _ = render_marker_scene(width, height, list(range(args.markers)), marker_size_range=(60, 200), seed=seed)
+        scenes.append(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY))
+
+    def measure(detect: Any) -> Tuple[float, List[Dict[int, np.ndarray]]]:
+        detect(scenes[0])  # Calentamiento (creación del detector y del pool)
+        results, start = [], time.perf_counter()
+        for gray in scenes:
+            results.append(as_dict(*detect(gray)))
+        return (time.perf_counter() - start) / len(scenes) * 1000.0, results
+
+    base_ms, reference = measure(detect_markers)
+    print(f"núcleos: {os.cpu_count()}  hilos OpenCV: {cv2.getNumThreads()}  resolución: {args.resolution}")
+    print(f"frame completo: {base_ms:.1f} ms, {sum(len(result) for result in reference)} marcadores")
+    print(f"{'rejilla':>7} {'hilos':>5} {'tiempo':>9} {'aceleración':>12} {'coincide':>9}")
+    for grid_str in args.grids:
+        grid = tuple(int(value) for value in grid_str.lower().split("x"))
+        for workers in args.workers:
+            elapsed_ms, results = measure(
+                lambda gray: detect_markers_tiled(gray, grid=grid, overlap=args.overlap, workers=workers)
+            )
+            match = all(results_match(ref, res) for ref, res in zip(reference, results))
+            print(f"{grid_str:>7} {workers:>5} {elapsed_ms:>7.1f}ms {base_ms / elapsed_ms:>11.2f}x {'sí' if match else 'NO':>9}")
+
+
+if __name__ == "__main__":
+    main()
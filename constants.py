@@ -3,10 +3,45 @@ Archivo de constantes de configuración para la aplicación.
 """
 
 import cv2
+from typing import Tuple
 
 # Ruta de la carpeta que contiene las imágenes de los marcadores aumentados
 AUGMENTED_MARKERS_PATH: str = "augmented_markers"
 
+# Contenido animado de los marcadores (videos o GIFs con el ID como nombre, en la misma carpeta):
+# frames decodificados por adelantado por marcador y lado máximo al que se reducen. Para seguir el
+# reloj se saltan como mucho MEDIA_MAX_SKIP frames por frame decodificado; si hace falta más, el video
+# se ralentiza. Los hilos decodificadores suben su nice en MEDIA_DECODER_NICE (solo Linux) para que
+# el bucle de frames tenga prioridad
+MEDIA_VIDEO_EXTENSIONS: Tuple[str, ...] = (".mp4", ".avi", ".mov", ".mkv", ".webm", ".gif")
+MEDIA_BUFFER_SIZE: int = 8
+MEDIA_MAX_SIDE: int = 512
+MEDIA_MAX_SKIP: int = 2
+MEDIA_DECODER_NICE: int = 19
+
+# Planificación de las superposiciones según el área proyectada del marcador (en píxeles²):
+# por debajo de OVERLAY_MIN_AREA no se dibuja; por debajo de OVERLAY_APPROX_AREA, o con menos de
+# OVERLAY_MIN_VISIBLE_FRACTION dentro del frame, se rellena con el color medio del contenido; los
+# marcadores con menos de OVERLAY_NEAR_AREA (lejanos) refrescan su contenido cada
+# OVERLAY_FAR_REFRESH_INTERVAL frames. Se reutiliza la deformación anterior si las esquinas se movieron
+# menos de OVERLAY_REUSE_TOLERANCE píxeles. El coste de cada marcador dibujado se mide en píxeles
+# deformados equivalentes: su área si se deforma, OVERLAY_REUSE_COST u OVERLAY_APPROX_COST veces su
+# área si se reutiliza o se aproxima, más OVERLAY_MARKER_COST por marcador (y por etiqueta de ID).
+# Cada frame se gasta como máximo OVERLAY_FRAME_BUDGET veces el área del frame, empezando por los
+# marcadores más grandes; los que ya no caben se dibujan de forma más barata o no se dibujan
+ENABLE_OVERLAY_SCHEDULER: bool = True
+OVERLAY_MIN_AREA: float = 64.0
+OVERLAY_APPROX_AREA: float = 900.0
+OVERLAY_NEAR_AREA: float = 10000.0
+OVERLAY_LABEL_MIN_AREA: float = 2500.0
+OVERLAY_MIN_VISIBLE_FRACTION: float = 0.25
+OVERLAY_FAR_REFRESH_INTERVAL: int = 3
+OVERLAY_REUSE_TOLERANCE: float = 1.0
+OVERLAY_FRAME_BUDGET: float = 0.5
+OVERLAY_REUSE_COST: float = 0.05
+OVERLAY_APPROX_COST: float = 0.03
+OVERLAY_MARKER_COST: float = 2000.0
+
 # Parámetros para la detección de manos
 ENABLE_HAND_DETECTION: bool = True
 
@@ -24,6 +59,24 @@ ARUCO_MARKER_SIZE: int = 6
 ARUCO_TOTAL_MARKERS: int = 250
 ARUCO_DICT: int = cv2.aruco.DICT_4X4_50
 
+# Preset de DetectorParameters ("default" usa los valores de OpenCV; "fast", "balanced" y "robust"
+# se generan con tune_detector_parameters.py en el archivo de presets)
+ARUCO_DETECTOR_PRESET: str = "default"
+ARUCO_PRESETS_PATH: str = "config/aruco_presets.yaml"
+
+# Detección de grueso a fino: niveles de reducción (0 = resolución completa, 1 = mitad, 2 = cuarto...)
+# y número máximo de iteraciones del refinamiento de esquinas a resolución completa
+ARUCO_PYRAMID_LEVELS: int = 0
+ARUCO_PYRAMID_REFINE_ITERATIONS: int = 30
+
+# Detección por teselas en paralelo para frames de alta resolución: rejilla (filas, columnas),
+# solapamiento en píxeles (mayor que la caja envolvente del marcador más grande esperado, ~1.5 veces
+# su lado si puede aparecer rotado) y número de hilos
+# (0 = número de núcleos). Con (1, 1) se detecta el frame completo de una vez.
+ARUCO_TILE_GRID: Tuple[int, int] = (1, 1)
+ARUCO_TILE_OVERLAP: int = 320
+ARUCO_TILE_WORKERS: int = 0
+
 # Parámetros para el sistema de caché de marcadores
 CACHE_MAX_LOST_FRAMES: int = 18
 
@@ -32,3 +85,9 @@ CLICK_DISTANCE_THRESHOLD: float = 60.0
 
 # Parámetro para optimizar la cantidad de frames procesados, se procesa solo el N-esimo frame, se saltan frames
 FRAME_INTERVAL: int = 2
+
+# Parámetros del bus de frames en memoria compartida para consumidores locales (desactivado por
+# defecto: reserva un bloque compartido de FRAME_BUS_SLOTS frames, unos 12 MB a 800x600)
+ENABLE_FRAME_BUS: bool = False
+FRAME_BUS_NAME: str = "ar_frames"
+FRAME_BUS_SLOTS: int = 8
@@ -0,0 +1,425 @@
+"""
+Módulo con un bus de frames en memoria compartida para consumidores locales.
+
+El publicador escribe cada frame compuesto y sus metadatos (marcadores y landmarks de las manos)
+en un buffer circular de ``multiprocessing.shared_memory``. Cada ranura lleva un número de
+secuencia al inicio y al final (seqlock): el publicador nunca espera a los consumidores y estos
+leen a su propio ritmo, sin copiar el frame, comprobando después que la ranura no fue reescrita.
+
+Disposición del bloque compartido:
+    cabecera (64 bytes): magic, ranuras, ancho, alto, canales, capacidad de metadatos,
+                         tamaño de ranura, PID del publicador, última secuencia publicada
+    ranura i: seq inicial (u64), seq final (u64), timestamp (f64), longitud de metadatos (u64),
+              frame (alto x ancho x canales, uint8), metadatos (JSON)
+
+Uso como consumidor:
+    python frame_bus.py ar_frames
+"""
+
+import os
+import sys
+import json
+import time
+import struct
+import logging
+import threading
+from multiprocessing import shared_memory, resource_tracker
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Configurar logger específico para este módulo
+logger = logging.getLogger(__name__)
+
+BUS_MAGIC: bytes = b"ARBUS001"
+HEADER_FORMAT: str = "<8sIIIIII"
+HEADER_SIZE: int = 64
+OWNER_PID_OFFSET: int = 32
+LATEST_SEQ_OFFSET: int = 56
+SLOT_HEADER_SIZE: int = 32
+SLOT_ALIGNMENT: int = 64
+
+# Protege la desactivación temporal del registro en el resource_tracker
+_tracker_lock = threading.Lock()
+
+
+def _slot_size(width: int, height: int, channels: int, meta_capacity: int) -> int:
+    size = SLOT_HEADER_SIZE + width * height * channels + meta_capacity
+    return (size + SLOT_ALIGNMENT - 1) // SLOT_ALIGNMENT * SLOT_ALIGNMENT
+
+
+def _attach_untracked(name: str) -> shared_memory.SharedMemory:
+    """
+    Se adjunta a un bloque existente sin registrarlo en el ``resource_tracker`` del proceso.
+
+    Antes de Python 3.13, adjuntarse registra el bloque y el tracker lo elimina al salir el
+    consumidor, rompiendo el bus para los demás procesos. Tampoco se puede desregistrar después,
+    porque el tracker puede ser el mismo que el del publicador (procesos hijos).
+
+    Args:
+        name (str): Nombre del bloque.
+
+    Returns:
+        shared_memory.SharedMemory: Bloque adjunto.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    with _tracker_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args, **kwargs: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+def _is_stale_bus(name: str) -> bool:
+    """
+    Comprueba si un bloque existente es un bus de frames cuyo publicador ya terminó.
+
+    Args:
+        name (str): Nombre del bloque.
+
+    Returns:
+        bool: True si es un bus de frames y el proceso que lo creó ya no existe.
+    """
+    # Sin PID no se puede saber (y en Windows los bloques no sobreviven a su creador)
+    if os.name != "posix":
+        return False
+    shm = _attach_untracked(name)
+    try:
+        if len(shm.buf) < HEADER_SIZE or bytes(shm.buf[:len(BUS_MAGIC)]) != BUS_MAGIC:
+            return False
+        (owner_pid,) = struct.unpack_from("<I", shm.buf, OWNER_PID_OFFSET)
+    finally:
+        shm.close()
+    if owner_pid == 0:
+        return False
+    try:
+        os.kill(owner_pid, 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        return False
+    return False
+
+
+def build_frame_metadata(
+    markers: Tuple[Sequence[Any], Any],
+    landmark_list: Sequence[Sequence[int]],
+    frame_index: int
+) -> Dict[str, Any]:
+    """
+    Construye los metadatos serializables de un frame procesado.
+
+    Args:
+        markers (Tuple[Sequence[Any], Any]): Bounding boxes e IDs de los marcadores actuales.
+        landmark_list (Sequence[Sequence[int]]): Landmarks de la mano ([id, x, y]).
+        frame_index (int): Índice del frame en la captura.
+
+    Returns:
+        Dict[str, Any]: Diccionario con el índice del frame, los marcadores y los landmarks.
+    """
+    bboxes, ids = markers
+    marker_list: List[Dict[str, Any]] = []
+    if ids is not None:
+        for bbox, marker_id in zip(bboxes, np.asarray(ids).reshape(-1)):
+            corners = np.asarray(bbox, dtype=np.float32).reshape(4, 2)
+            marker_list.append({"id": int(marker_id), "corners": np.round(corners, 2).tolist()})
+    return {
+        "frame_index": frame_index,
+        "markers": marker_list,
+        "hands": [[int(value) for value in landmark] for landmark in landmark_list],
+    }
+
+
+class BusFrame:
+    """
+    Frame leído del bus. ``frame`` es una vista de la memoria compartida (salvo si se pidió copia):
+    es válida mientras ``is_valid()`` devuelva True.
+    """
+
+    def __init__(self, subscriber: "FrameBusSubscriber", seq: int, timestamp: float,
+                 frame: np.ndarray, metadata: Dict[str, Any]) -> None:
+        self.subscriber: "FrameBusSubscriber" = subscriber
+        self.seq: int = seq
+        self.timestamp: float = timestamp
+        self.frame: np.ndarray = frame
+        self.metadata: Dict[str, Any] = metadata
+
+    def is_valid(self) -> bool:
+        """
+        Comprueba que el publicador no haya reescrito la ranura desde la lectura.
+
+        Returns:
+            bool: True si el contenido de ``frame`` sigue correspondiendo a ``seq``.
+        """
+        return self.subscriber._slot_begin(self.seq) == self.seq
+
+
+class FrameBusPublisher:
+    """
+    Clase que publica frames y metadatos en el buffer circular compartido.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        width: int,
+        height: int,
+        channels: int = 3,
+        slots: int = 8,
+        meta_capacity: int = 65536,
+        replace_stale: bool = False
+    ) -> None:
+        # Con una sola ranura el consumidor no tendría margen frente a la escritura en curso
+        if slots < 2:
+            raise ValueError(f"El bus de frames necesita al menos 2 ranuras (recibido {slots})")
+        self.name: str = name
+        self.width: int = width
+        self.height: int = height
+        self.channels: int = channels
+        self.slots: int = slots
+        self.meta_capacity: int = meta_capacity
+        self.slot_size: int = _slot_size(width, height, channels, meta_capacity)
+        size = HEADER_SIZE + slots * self.slot_size
+
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            # Solo se reemplaza un bloque huérfano (o si se pide explícitamente): otro publicador
+            # en marcha con el mismo nombre perdería a sus consumidores
+            if not replace_stale and not _is_stale_bus(name):
+                raise FileExistsError(
+                    f"El bus de frames {name} ya existe y su publicador sigue activo; "
+                    f"usa otro nombre o replace_stale=True"
+                ) from None
+            logger.warning(f"El bus de frames {name} ya existía sin publicador activo; se reemplaza.")
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+
+        self._latest = np.ndarray((1,), dtype=np.uint64, buffer=self.shm.buf, offset=LATEST_SEQ_OFFSET)
+        self._latest[0] = 0
+        struct.pack_into(HEADER_FORMAT, self.shm.buf, 0, BUS_MAGIC, slots, width, height, channels,
+                         meta_capacity, self.slot_size)
+        struct.pack_into("<I", self.shm.buf, OWNER_PID_OFFSET, os.getpid())
+        self._slot_headers: List[np.ndarray] = []
+        self._slot_frames: List[np.ndarray] = []
+        for slot in range(slots):
+            offset = HEADER_SIZE + slot * self.slot_size
+            header = np.ndarray((4,), dtype=np.uint64, buffer=self.shm.buf, offset=offset)
+            header[:] = 0
+            self._slot_headers.append(header)
+            self._slot_frames.append(np.ndarray((height, width, channels), dtype=np.uint8,
+                                                buffer=self.shm.buf, offset=offset + SLOT_HEADER_SIZE))
+        self.seq: int = 0
+
+    def publish(self, frame: np.ndarray, metadata: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Escribe un frame y sus metadatos en la siguiente ranura.
+
+        Args:
+            frame (np.ndarray): Frame compuesto (alto x ancho x canales, uint8).
+            metadata (Optional[Dict[str, Any]]): Metadatos serializables a JSON.
+
+        Returns:
+            int: Número de secuencia asignado.
+        """
+        if frame.shape != (self.height, self.width, self.channels):
+            raise ValueError(
+                f"El frame {frame.shape} no coincide con el bus {(self.height, self.width, self.channels)}"
+            )
+        meta_bytes = json.dumps(metadata or {}).encode("utf-8")
+        if len(meta_bytes) > self.meta_capacity:
+            raise ValueError(f"Los metadatos ({len(meta_bytes)} bytes) exceden la capacidad del bus")
+
+        seq = self.seq + 1
+        slot = (seq - 1) % self.slots
+        header = self._slot_headers[slot]
+        meta_offset = HEADER_SIZE + slot * self.slot_size + SLOT_HEADER_SIZE + self.width * self.height * self.channels
+
+        # Seqlock: seq inicial, datos, seq final y por último la secuencia más reciente
+        header[0] = seq
+        np.copyto(self._slot_frames[slot], frame)
+        self.shm.buf[meta_offset:meta_offset + len(meta_bytes)] = meta_bytes
+        header[2:4] = (np.float64(time.time()).view(np.uint64), len(meta_bytes))
+        header[1] = seq
+        self._latest[0] = seq
+        self.seq = seq
+        return seq
+
+    def close(self, unlink: bool = True) -> None:
+        """
+        Cierra el bus y, por defecto, elimina el bloque compartido.
+
+        Args:
+            unlink (bool): Flag para eliminar el bloque.
+        """
+        self._latest = None
+        self._slot_headers = []
+        self._slot_frames = []
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+class FrameBusSubscriber:
+    """
+    Clase cliente que lee frames del bus a su propio ritmo.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+        self.shm = _attach_untracked(name)
+        magic, slots, width, height, channels, meta_capacity, slot_size = struct.unpack_from(
+            HEADER_FORMAT, self.shm.buf, 0
+        )
+        if magic != BUS_MAGIC:
+            self.shm.close()
+            raise ValueError(f"El bloque {name} no es un bus de frames")
+        self.slots: int = slots
+        self.width: int = width
+        self.height: int = height
+        self.channels: int = channels
+        self.meta_capacity: int = meta_capacity
+        self.slot_size: int = slot_size
+        self._latest = np.ndarray((1,), dtype=np.uint64, buffer=self.shm.buf, offset=LATEST_SEQ_OFFSET)
+        self._slot_headers: List[np.ndarray] = [
+            np.ndarray((4,), dtype=np.uint64, buffer=self.shm.buf, offset=HEADER_SIZE + slot * slot_size)
+            for slot in range(slots)
+        ]
+        self.last_seq: int = 0
+        self.dropped: int = 0
+
+    def latest_seq(self) -> int:
+        """
+        Returns:
+            int: Última secuencia publicada (0 si aún no hay frames).
+        """
+        return int(self._latest[0])
+
+    def _slot_begin(self, seq: int) -> int:
+        return int(self._slot_headers[(seq - 1) % self.slots][0])
+
+    def read(self, seq: int, copy: bool = False) -> Optional[BusFrame]:
+        """
+        Lee el frame con la secuencia indicada.
+
+        Args:
+            seq (int): Secuencia a leer.
+            copy (bool): Flag para copiar el frame en lugar de devolver una vista.
+
+        Returns:
+            Optional[BusFrame]: El frame, o None si aún no se publicó o ya fue reescrito.
+        """
+        if seq <= 0:
+            return None
+        slot = (seq - 1) % self.slots
+        header = self._slot_headers[slot]
+        if int(header[1]) != seq:
+            return None
+
+        offset = HEADER_SIZE + slot * self.slot_size + SLOT_HEADER_SIZE
+        frame = np.ndarray((self.height, self.width, self.channels), dtype=np.uint8, buffer=self.shm.buf, offset=offset)
+        frame.flags.writeable = False
+        if copy:
+            frame = frame.copy()
+        timestamp = float(header[2:3].view(np.float64)[0])
+        meta_len = int(header[3])
+        meta_offset = offset + self.width * self.height * self.channels
+        meta_bytes = bytes(self.shm.buf[meta_offset:meta_offset + meta_len])
+
+        # Si el publicador empezó a reescribir la ranura durante la lectura, se descarta
+        if int(header[0]) != seq:
+            return None
+        try:
+            metadata = json.loads(meta_bytes) if meta_bytes else {}
+        except ValueError:
+            return None
+        return BusFrame(self, seq, timestamp, frame, metadata)
+
+    def read_latest(self, copy: bool = False) -> Optional[BusFrame]:
+        """
+        Lee el frame más reciente.
+
+        Args:
+            copy (bool): Flag para copiar el frame.
+
+        Returns:
+            Optional[BusFrame]: El frame más reciente, o None si no hay ninguno disponible.
+        """
+        bus_frame = self.read(self.latest_seq(), copy=copy)
+        if bus_frame is not None:
+            self.last_seq = bus_frame.seq
+        return bus_frame
+
+    def next(self, timeout: Optional[float] = None, copy: bool = False, poll_interval: float = 0.001) -> Optional[BusFrame]:
+        """
+        Devuelve el siguiente frame posterior al último leído. Si el consumidor se quedó atrás y
+        las ranuras ya fueron reescritas, salta al frame más antiguo disponible y contabiliza los
+        frames perdidos en ``dropped``.
+
+        Args:
+            timeout (Optional[float]): Tiempo máximo de espera (segundos); None espera indefinidamente.
+            copy (bool): Flag para copiar el frame.
+            poll_interval (float): Intervalo de sondeo mientras no hay frames nuevos (segundos).
+
+        Returns:
+            Optional[BusFrame]: El siguiente frame, o None si venció el tiempo de espera.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            latest = self.latest_seq()
+            if latest > self.last_seq:
+                # Dejar una ranura de margen para la que el publicador puede estar escribiendo
+                oldest = max(1, latest - self.slots + 2)
+                seq = max(self.last_seq + 1, oldest)
+                bus_frame = self.read(seq, copy=copy)
+                if bus_frame is not None:
+                    self.dropped += seq - self.last_seq - 1
+                    self.last_seq = seq
+                    return bus_frame
+                # La ranura se reescribió entre la consulta y la lectura: reintentar si queda tiempo
+                if deadline is not None and time.monotonic() >= deadline:
+                    return None
+                continue
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(poll_interval)
+
+    def close(self) -> None:
+        """
+        Cierra la conexión con el bus (no elimina el bloque compartido).
+        """
+        self._latest = None
+        self._slot_headers = []
+        self.shm.close()
+
+
+def main() -> None:
+    """
+    Consumidor de ejemplo: muestra el ritmo de lectura y los marcadores de cada frame.
+    """
+    name = sys.argv[1] if len(sys.argv) > 1 else "ar_frames"
+    subscriber = FrameBusSubscriber(name)
+    print(f"Conectado a {name}: {subscriber.width}x{subscriber.height}, {subscriber.slots} ranuras")
+    count, start = 0, time.monotonic()
+    try:
+        while True:
+            bus_frame = subscriber.next(timeout=5.0)
+            if bus_frame is None:
+                print("Sin frames nuevos en 5 s")
+                continue
+            count += 1
+            marker_ids = [marker["id"] for marker in bus_frame.metadata.get("markers", [])]
+            elapsed = time.monotonic() - start
+            print(f"seq={bus_frame.seq} marcadores={marker_ids} fps={count / elapsed:.1f} perdidos={subscriber.dropped}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        subscriber.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,189 @@
 """
 Módulo para configurar el sistema de logging a partir de un archivo de configuración YAML.
-Este módulo permite definir múltiples handlers (consola, archivo, etc.) desde un archivo .yaml.
+Este módulo permite definir múltiples handlers (consola, archivo, métricas, etc.) desde un archivo .yaml.
+
+Si la sección ``async`` está habilitada, los handlers reales se ejecutan en un hilo de fondo
+(``QueueListener``) y el hilo del bucle de frames solo encola los registros, de modo que una
+escritura lenta en disco o consola nunca bloquea el procesamiento de un frame.
 """
 
 import os
+import json
+import time
+import queue
+import atexit
 import logging
+import logging.handlers
+import threading
 import yaml
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
+
+# Nombre del logger dedicado a los registros de métricas estructuradas
+METRICS_LOGGER_NAME: str = "metrics"
+
+# Listener y handler de cola activos cuando el modo asíncrono está habilitado
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional["NonBlockingQueueHandler"] = None
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler que nunca bloquea: si la cola está llena, el registro se descarta
+    y se contabiliza en lugar de esperar a que el hilo de fondo la vacíe.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[Any]") -> None:
+        super().__init__(log_queue)
+        self.dropped_records: int = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped_records += 1
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Filtro que limita los mensajes repetitivos (por ejemplo, los emitidos en cada frame).
+
+    Los registros se agrupan por logger y línea de origen (los mensajes se construyen con
+    f-strings, por lo que el texto cambia en cada frame). Cada grupo
+    puede emitir como máximo ``burst`` registros por ventana de ``interval`` segundos; el
+    primer registro de la ventana siguiente indica cuántos se suprimieron. Si la misma
+    instancia se comparte entre varios handlers, cada registro se contabiliza una sola vez.
+    """
+
+    def __init__(self, interval: float = 1.0, burst: int = 5) -> None:
+        super().__init__()
+        self.interval: float = interval
+        self.burst: int = burst
+        self._windows: Dict[Tuple[str, str, int], List[float]] = {}
+        self._lock = threading.Lock()
+        self._last_record: Optional[logging.LogRecord] = None
+        self._last_decision: bool = True
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # Las métricas tienen su propio destino y no se limitan
+        if hasattr(record, "metric"):
+            return True
+
+        with self._lock:
+            if record is self._last_record:
+                return self._last_decision
+            self._last_record = record
+            self._last_decision = self._check(record)
+            return self._last_decision
+
+    def _check(self, record: logging.LogRecord) -> bool:
+        """
+        Decide si el registro entra en la ventana de su grupo y actualiza los contadores.
+
+        Args:
+            record (logging.LogRecord): Registro a evaluar.
+
+        Returns:
+            bool: True si el registro debe emitirse.
+        """
+        key = (record.name, record.pathname, record.lineno)
+        now = time.monotonic()
+        # Ventana: [inicio, emitidos, suprimidos]
+        window = self._windows.get(key)
+        if window is None or now - window[0] >= self.interval:
+            suppressed = int(window[2]) if window is not None else 0
+            self._windows[key] = [now, 1, 0]
+            if suppressed:
+                record.msg = f"{record.getMessage()} (suprimidos {suppressed} mensajes repetidos)"
+                record.args = None
+            return True
+        if window[1] < self.burst:
+            window[1] += 1
+            return True
+        window[2] += 1
+        return False
+
+
+class MetricsOnlyFilter(logging.Filter):
+    """
+    Filtro que deja pasar solo los registros de métricas (o excluye todos ellos si ``exclude`` es True).
+    """
+
+    def __init__(self, exclude: bool = False) -> None:
+        super().__init__()
+        self.exclude: bool = exclude
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return hasattr(record, "metric") != self.exclude
+
+
+class MetricsFormatter(logging.Formatter):
+    """
+    Formateador que serializa los registros de métricas como una línea JSON.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {"timestamp": record.created, "name": record.getMessage()}
+        payload.update(getattr(record, "metric", {}))
+        return json.dumps(payload, default=str)
+
+
+def log_metric(name: str, **values: Any) -> None:
+    """
+    Emite un registro de métrica estructurada a través del logger de métricas.
+
+    Args:
+        name (str): Nombre de la métrica (por ejemplo, "frame").
+        **values (Any): Campos de la métrica (por ejemplo, fps=30.0, latency_ms=12.5).
+    """
+    logging.getLogger(METRICS_LOGGER_NAME).info(name, extra={"metric": values})
+
+
+def _build_handler(handler_conf: Dict[str, Any]) -> logging.Handler:
+    """
+    Construye un handler a partir de su configuración.
+
+    Args:
+        handler_conf (Dict[str, Any]): Configuración del handler.
+
+    Returns:
+        logging.Handler: Handler configurado.
+    """
+    handler_type = handler_conf.get('type', 'console').lower()
+    level_str = handler_conf.get('level', 'DEBUG')
+    level = getattr(logging, level_str.upper(), logging.DEBUG)
+    fmt = handler_conf.get('format', "%(asctime)s [%(levelname)s] %(message)s")
+
+    handler: logging.Handler
+    if handler_type == 'console':
+        handler = logging.StreamHandler()
+    elif handler_type in ('file', 'metrics'):
+        filename = handler_conf.get('filename', 'metrics.jsonl' if handler_type == 'metrics' else 'app.log')
+        mode = handler_conf.get('mode', 'a')
+        # Asegurarse de que el directorio del archivo exista
+        directory = os.path.dirname(filename)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        # Con max_bytes > 0 el archivo rota al alcanzar ese tamaño y conserva backup_count copias
+        max_bytes = int(handler_conf.get('max_bytes', 0))
+        if max_bytes > 0:
+            handler = logging.handlers.RotatingFileHandler(
+                filename, mode=mode, maxBytes=max_bytes, backupCount=int(handler_conf.get('backup_count', 1))
+            )
+        else:
+            handler = logging.FileHandler(filename, mode=mode)
+    else:
+        raise ValueError(f"Tipo de handler desconocido: {handler_type}")
+
+    if handler_type == 'metrics':
+        handler.setFormatter(MetricsFormatter())
+        handler.addFilter(MetricsOnlyFilter())
+    else:
+        handler.setFormatter(logging.Formatter(fmt))
+        handler.addFilter(MetricsOnlyFilter(exclude=True))
+
+    handler.setLevel(level)
+    return handler
+
 
 def configure_logging(config_path: str) -> None:
     """
@@ -15,14 +192,19 @@ def configure_logging(config_path: str) -> None:
     Args:
         config_path (str): Ruta al archivo de configuración YAML.
     """
+    global _queue_listener, _queue_handler
+
     if not os.path.exists(config_path):
         raise FileNotFoundError(f"El archivo de configuración de logging no existe: {config_path}")
 
     with open(config_path, 'r', encoding='utf-8') as f:
         config: Dict[str, Any] = yaml.safe_load(f)
 
-    # Limpiar los handlers existentes
+    # Detener el listener anterior y cerrar los handlers existentes
+    shutdown_logging()
     logger = logging.getLogger()
+    for handler in logger.handlers:
+        handler.close()
     logger.handlers = []
 
     # Establecer el nivel global de logging
@@ -31,27 +213,70 @@ def configure_logging(config_path: str) -> None:
     logger.setLevel(global_level)
 
     # Configurar cada handler definido en la configuración
-    handlers: List[Dict[str, Any]] = config.get('handlers', [])
-    for handler_conf in handlers:
-        handler_type = handler_conf.get('type', 'console').lower()
-        level_str = handler_conf.get('level', 'DEBUG')
-        level = getattr(logging, level_str.upper(), logging.DEBUG)
-        fmt = handler_conf.get('format', "%(asctime)s [%(levelname)s] %(message)s")
-        formatter = logging.Formatter(fmt)
-
-        if handler_type == 'console':
-            handler = logging.StreamHandler()
-        elif handler_type == 'file':
-            filename = handler_conf.get('filename', 'app.log')
-            mode = handler_conf.get('mode', 'a')
-            # Asegurarse de que el directorio del archivo exista
-            directory = os.path.dirname(filename)
-            if directory and not os.path.exists(directory):
-                os.makedirs(directory, exist_ok=True)
-            handler = logging.FileHandler(filename, mode=mode)
-        else:
-            raise ValueError(f"Tipo de handler desconocido: {handler_type}")
+    handlers: List[logging.Handler] = [
+        _build_handler(handler_conf) for handler_conf in config.get('handlers', [])
+    ]
+
+    # Limitación de mensajes repetitivos, aplicada antes de encolar o escribir
+    rate_limit_conf: Optional[Dict[str, Any]] = config.get('rate_limit')
+    rate_limit_filter: Optional[RateLimitFilter] = None
+    if rate_limit_conf and rate_limit_conf.get('enabled', True):
+        rate_limit_filter = RateLimitFilter(
+            interval=float(rate_limit_conf.get('interval', 1.0)),
+            burst=int(rate_limit_conf.get('burst', 5))
+        )
+
+    async_conf: Dict[str, Any] = config.get('async') or {}
+    if async_conf.get('enabled', False):
+        log_queue: "queue.Queue[Any]" = queue.Queue(maxsize=int(async_conf.get('queue_size', 10000)))
+        queue_handler = NonBlockingQueueHandler(log_queue)
+        if rate_limit_filter is not None:
+            queue_handler.addFilter(rate_limit_filter)
+        logger.addHandler(queue_handler)
+        _queue_handler = queue_handler
+        _queue_listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _queue_listener.start()
+    else:
+        for handler in handlers:
+            if rate_limit_filter is not None:
+                handler.addFilter(rate_limit_filter)
+            logger.addHandler(handler)
+
+
+def shutdown_logging() -> None:
+    """
+    Detiene el listener asíncrono (si existe), vaciando los registros pendientes en la cola, e
+    informa de los registros descartados por tener la cola llena.
+
+    Los handlers reales pasan a colgar directamente del logger raíz, de modo que los registros
+    emitidos después (por ejemplo, durante la salida del programa) se siguen escribiendo de forma
+    síncrona en lugar de quedarse en una cola que ya nadie lee.
+    """
+    global _queue_listener, _queue_handler
+
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        root = logging.getLogger()
+        if _queue_handler is not None:
+            root.removeHandler(_queue_handler)
+        for handler in _queue_listener.handlers:
+            # El limitador de mensajes se aplicaba al encolar; ahora se aplica en cada handler
+            if _queue_handler is not None:
+                for log_filter in _queue_handler.filters:
+                    handler.addFilter(log_filter)
+            root.addHandler(handler)
+        dropped = _queue_handler.dropped_records if _queue_handler is not None else 0
+        if dropped:
+            # Se escribe directamente en los handlers para que el aviso no pase por el limitador
+            record = logging.getLogger(__name__).makeRecord(
+                __name__, logging.WARNING, __file__, 0,
+                f"Se descartaron {dropped} registros de log por tener la cola asíncrona llena", None, None
+            )
+            for handler in _queue_listener.handlers:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+        _queue_listener = None
+        _queue_handler = None
+
 
-        handler.setLevel(level)
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
+atexit.register(shutdown_logging)
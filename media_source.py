@@ -0,0 +1,298 @@
+"""
+Módulo para el contenido animado (videos o GIFs) de los marcadores.
+
+Cada ``VideoMediaSource`` decodifica por adelantado en un hilo de fondo hacia un buffer circular
+pequeño y acotado. El bucle de frames solo toma el frame que corresponde al instante de
+reproducción actual, sin bloquear nunca. La decodificación y el reloj de reproducción se pausan
+mientras el marcador no es visible.
+
+La decodificación va al ritmo del consumidor: si el bucle de frames es más lento que el video, solo
+se decodifican los frames que se llegarán a mostrar y el resto se salta con ``grab``.
+"""
+
+import os
+import time
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+import cv2
+import numpy as np
+from typing import Deque, Dict, Optional, Tuple
+
+from constants import MEDIA_BUFFER_SIZE, MEDIA_MAX_SIDE, MEDIA_MAX_SKIP, MEDIA_DECODER_NICE, MEDIA_VIDEO_EXTENSIONS
+
+# Configurar logger específico para este módulo
+logger = logging.getLogger(__name__)
+
+# FPS supuesto cuando el contenedor no lo indica (frecuente en GIFs)
+DEFAULT_MEDIA_FPS: float = 25.0
+
+
+class MediaSource(ABC):
+    """
+    Clase base abstracta para el contenido que se superpone sobre un marcador.
+    """
+
+    @abstractmethod
+    def current_frame(self) -> Optional[np.ndarray]:
+        """
+        Devuelve el frame a mostrar en este instante, sin bloquear.
+
+        Returns:
+            Optional[np.ndarray]: Frame BGR, o None si aún no hay ninguno.
+        """
+
+    def set_visible(self, visible: bool) -> None:
+        """
+        Indica si el marcador es visible; el contenido no visible no avanza ni se decodifica.
+
+        Args:
+            visible (bool): Flag de visibilidad.
+        """
+
+    def close(self) -> None:
+        """
+        Libera los recursos de la fuente.
+        """
+
+
+class VideoMediaSource(MediaSource):
+    """
+    Fuente de video o GIF con decodificación anticipada en un hilo de fondo.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        buffer_size: int = MEDIA_BUFFER_SIZE,
+        max_side: int = MEDIA_MAX_SIDE,
+        loop: bool = True,
+        max_skip: int = MEDIA_MAX_SKIP
+    ) -> None:
+        self.path: str = path
+        self.buffer_size: int = buffer_size
+        self.max_side: int = max_side
+        self.loop: bool = loop
+        self.max_skip: int = max_skip
+
+        self.capture = cv2.VideoCapture(path)
+        if not self.capture.isOpened():
+            raise ValueError(f"El video {path} no se pudo abrir.")
+        fps = self.capture.get(cv2.CAP_PROP_FPS)
+        self.fps: float = fps if 0 < fps < 240 else DEFAULT_MEDIA_FPS
+
+        # Buffer circular de (índice de frame, frame) y estado compartido con el hilo decodificador
+        self.buffer: Deque[Tuple[int, np.ndarray]] = deque()
+        self.condition = threading.Condition()
+        self.decoded_frames: int = 0
+        self.skipped_frames: int = 0
+        self.finished: bool = False
+        self.closed: bool = False
+        self.visible: bool = False
+
+        # Reloj de reproducción: solo avanza mientras el marcador es visible
+        self.media_time: float = 0.0
+        self.resumed_at: Optional[float] = None
+
+        # Intervalo medio entre llamadas a current_frame, para decodificar solo lo que se mostrará
+        self.consume_interval: Optional[float] = None
+        self.last_consumed_at: Optional[float] = None
+
+        # El primer frame se decodifica al cargar para tener siempre algo que mostrar
+        first = self._decode_next()
+        if first is None:
+            self.capture.release()
+            raise ValueError(f"El video {path} no contiene frames.")
+        self.current: np.ndarray = first[1]
+
+        self.thread = threading.Thread(target=self._decode_loop, name=f"media-{os.path.basename(path)}", daemon=True)
+        self.thread.start()
+
+    def _decode_next(self) -> Optional[Tuple[int, np.ndarray]]:
+        """
+        Decodifica el siguiente frame (volviendo al inicio si ``loop``), reducido a ``max_side``.
+
+        Returns:
+            Optional[Tuple[int, np.ndarray]]: Índice del frame y frame, o None al terminar.
+        """
+        ret, frame = self.capture.read()
+        if not ret and self.loop and self.decoded_frames > 0:
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.capture.read()
+            if not ret:
+                # Algunos contenedores (GIF) no admiten el salto: reabrir
+                self.capture.release()
+                self.capture = cv2.VideoCapture(self.path)
+                ret, frame = self.capture.read()
+        if not ret:
+            return None
+
+        height, width = frame.shape[:2]
+        scale = self.max_side / max(height, width)
+        if scale < 1.0:
+            frame = cv2.resize(frame, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+        index = self.decoded_frames
+        self.decoded_frames += 1
+        return index, frame
+
+    def _skip_to(self, index: int) -> None:
+        """
+        Avanza hasta ``index`` con ``grab`` los frames que no se llegarán a mostrar. ``grab`` evita la
+        conversión de color y la reducción del frame; según el backend, el decodificador del códec
+        puede ejecutarse igualmente.
+
+        Args:
+            index (int): Índice del siguiente frame que se quiere decodificar.
+        """
+        while self.decoded_frames < index:
+            if not self.capture.grab():
+                # Fin del video: _decode_next vuelve al inicio si corresponde
+                break
+            self.decoded_frames += 1
+            self.skipped_frames += 1
+
+    def _frame_step(self) -> float:
+        """
+        Frames de video que avanza el reloj entre dos llamadas a ``current_frame`` (al menos 1).
+        """
+        return max(1.0, (self.consume_interval or 0.0) * self.fps)
+
+    def _next_wanted_index(self) -> int:
+        """
+        Elige el siguiente frame a decodificar: el que estará vigente en la próxima llamada del
+        consumidor (medio paso antes, para tolerar variaciones de ritmo), después de los del buffer.
+        Si para llegar hay que saltar más de ``max_skip`` frames, el reloj de reproducción se retrasa
+        en lugar de gastar CPU en saltos: el video se ve más lento, pero el bucle de frames no.
+
+        Returns:
+            int: Índice del frame a decodificar.
+        """
+        step = self._frame_step()
+        wanted = self._playback_frame_index() + (step - 1.0) / 2.0
+        if self.buffer:
+            wanted = max(wanted, self.buffer[-1][0] + step)
+        excess = int(wanted) - self.decoded_frames - self.max_skip
+        if excess > 0:
+            self.media_time -= excess / self.fps
+            wanted -= excess
+        return int(wanted)
+
+    def _lower_priority(self) -> None:
+        """
+        Sube el nice del hilo decodificador (solo Linux, donde cada hilo tiene su prioridad) para que
+        la decodificación use el tiempo libre del bucle de frames en lugar de competir con él.
+        """
+        if MEDIA_DECODER_NICE <= 0 or not hasattr(os, "setpriority"):
+            return
+        try:
+            thread_id = threading.get_native_id()
+            nice = os.getpriority(os.PRIO_PROCESS, thread_id)
+            os.setpriority(os.PRIO_PROCESS, thread_id, min(nice + MEDIA_DECODER_NICE, 19))
+        except OSError:
+            pass
+
+    def _decode_loop(self) -> None:
+        """
+        Bucle del hilo decodificador: espera a que el marcador sea visible y haya hueco en el buffer.
+        """
+        self._lower_priority()
+        while True:
+            with self.condition:
+                while not self.closed and (not self.visible or len(self.buffer) >= self.buffer_size):
+                    self.condition.wait()
+                if self.closed:
+                    break
+                wanted = self._next_wanted_index()
+            try:
+                self._skip_to(wanted)
+                decoded = self._decode_next()
+            except cv2.error as e:
+                logger.error(f"Error al decodificar {self.path}: {e}")
+                decoded = None
+            with self.condition:
+                if decoded is None:
+                    self.finished = True
+                    break
+                self.buffer.append(decoded)
+        self.capture.release()
+
+    def _playback_frame_index(self) -> float:
+        media_time = self.media_time
+        if self.resumed_at is not None:
+            media_time += time.perf_counter() - self.resumed_at
+        return media_time * self.fps
+
+    def set_visible(self, visible: bool) -> None:
+        if visible == self.visible:
+            return
+        with self.condition:
+            if visible:
+                self.resumed_at = time.perf_counter()
+            elif self.resumed_at is not None:
+                self.media_time += time.perf_counter() - self.resumed_at
+                self.resumed_at = None
+                self.last_consumed_at = None
+            self.visible = visible
+            self.condition.notify_all()
+
+    def current_frame(self) -> Optional[np.ndarray]:
+        """
+        Avanza hasta el frame correspondiente al reloj de reproducción. Si el decodificador va
+        retrasado, se repite el último frame en lugar de esperar. El intervalo entre llamadas marca
+        qué frames decodifica el hilo de fondo.
+
+        Returns:
+            Optional[np.ndarray]: Frame actual.
+        """
+        now = time.perf_counter()
+        if self.visible and self.last_consumed_at is not None:
+            interval = now - self.last_consumed_at
+            self.consume_interval = interval if self.consume_interval is None \
+                else 0.8 * self.consume_interval + 0.2 * interval
+        self.last_consumed_at = now if self.visible else None
+        target_index = self._playback_frame_index()
+        with self.condition:
+            advanced = False
+            while self.buffer and self.buffer[0][0] <= target_index:
+                self.current = self.buffer.popleft()[1]
+                advanced = True
+            if advanced:
+                self.condition.notify_all()
+        return self.current
+
+    def close(self) -> None:
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join(timeout=1.0)
+
+
+def load_media_sources(folder_path: str) -> Dict[int, MediaSource]:
+    """
+    Carga el contenido animado (videos y GIFs) de cada marcador desde la carpeta especificada.
+    Igual que las imágenes, el nombre del archivo es el ID del marcador.
+
+    Args:
+        folder_path (str): Ruta de la carpeta con el contenido.
+
+    Returns:
+        Dict[int, MediaSource]: Diccionario con claves como IDs de marcador y valores como las fuentes.
+    """
+    media_sources: Dict[int, MediaSource] = {}
+    try:
+        media_files = os.listdir(folder_path)
+    except Exception as e:
+        raise FileNotFoundError(f"No se pudo acceder a la carpeta {folder_path}: {e}")
+
+    for media_file in media_files:
+        name, extension = os.path.splitext(media_file)
+        if extension.lower() not in MEDIA_VIDEO_EXTENSIONS:
+            continue
+        try:
+            marker_id = int(name)
+            media_sources[marker_id] = VideoMediaSource(os.path.join(folder_path, media_file))
+        except Exception as e:
+            logger.error(f"Error al cargar el video {media_file}: {e}")
+
+    return media_sources
@@ -0,0 +1,445 @@
+"""
+Módulo para ejecutar la aplicación de realidad aumentada sobre varias cámaras a la vez.
+
+Cada cámara se procesa en su propio worker (proceso o hilo) con su propio ``ARPipeline``
+(detector de manos, caché de marcadores y rectángulos). Las imágenes aumentadas se cargan una
+sola vez y se comparten en modo solo lectura mediante ``multiprocessing.shared_memory``.
+
+Uso:
+    python multi_camera.py --sources 0 1 --duration 30
+    python multi_camera.py --sources synthetic synthetic --mode thread --no-hands
+    python multi_camera.py --scaling 4 --duration 10
+    python multi_camera.py --sources 0 1 --bus-prefix ar_frames   # publica en ar_frames_0, ar_frames_1
+"""
+
+import os
+import time
+import queue
+import logging
+import argparse
+import threading
+import multiprocessing
+from multiprocessing import shared_memory
+import cv2
+import numpy as np
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from augment_markers import load_augmented_images
+from frame_bus import FrameBusPublisher, build_frame_metadata
+from synthetic_scene import SyntheticCapture
+import constants
+
+# Configurar logger específico para este módulo
+logger = logging.getLogger(__name__)
+
+# Índice del almacén compartido: ID de marcador -> (offset, forma)
+StoreIndex = Dict[int, Tuple[int, Tuple[int, ...]]]
+
+
+class SharedImageStore:
+    """
+    Almacén de imágenes aumentadas de solo lectura en un único bloque de memoria compartida.
+
+    El proceso que lo crea copia todas las imágenes en el bloque; los workers se adjuntan por
+    nombre con ``attach`` y obtienen vistas de numpy sin copiar los datos.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, index: StoreIndex, owner: bool) -> None:
+        self.shm: shared_memory.SharedMemory = shm
+        self.index: StoreIndex = index
+        self.owner: bool = owner
+        self.images: Dict[int, np.ndarray] = {}
+        for marker_id, (offset, shape) in index.items():
+            image = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=offset)
+            image.flags.writeable = False
+            self.images[marker_id] = image
+
+    @classmethod
+    def create(cls, images: Mapping[int, np.ndarray]) -> "SharedImageStore":
+        """
+        Crea el bloque de memoria compartida y copia las imágenes en él.
+
+        Args:
+            images (Mapping[int, np.ndarray]): Imágenes aumentadas por ID de marcador.
+
+        Returns:
+            SharedImageStore: Almacén propietario del bloque.
+        """
+        index: StoreIndex = {}
+        offset = 0
+        for marker_id, image in images.items():
+            index[int(marker_id)] = (offset, tuple(image.shape))
+            offset += image.nbytes
+        shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for marker_id, image in images.items():
+            start, _ = index[int(marker_id)]
+            shm.buf[start:start + image.nbytes] = np.ascontiguousarray(image, dtype=np.uint8).tobytes()
+        return cls(shm, index, owner=True)
+
+    @classmethod
+    def attach(cls, descriptor: Tuple[str, StoreIndex]) -> "SharedImageStore":
+        """
+        Se adjunta a un almacén existente a partir de su descriptor.
+
+        Args:
+            descriptor (Tuple[str, StoreIndex]): Nombre del bloque e índice (ver ``descriptor``).
+
+        Returns:
+            SharedImageStore: Almacén adjunto (no propietario).
+        """
+        name, index = descriptor
+        return cls(shared_memory.SharedMemory(name=name), index, owner=False)
+
+    def descriptor(self) -> Tuple[str, StoreIndex]:
+        """
+        Devuelve un descriptor serializable para adjuntarse al almacén desde otro proceso.
+
+        Returns:
+            Tuple[str, StoreIndex]: Nombre del bloque e índice de las imágenes.
+        """
+        return self.shm.name, self.index
+
+    def close(self) -> None:
+        """
+        Libera las vistas y cierra el bloque; el propietario además lo elimina.
+        """
+        self.images = {}
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def open_capture(source: Union[int, str], width: int, height: int) -> Any:
+    """
+    Abre una fuente de video: índice de cámara, ruta o URL, o ``"synthetic"``.
+
+    Args:
+        source (Union[int, str]): Fuente de video.
+        width (int): Ancho solicitado.
+        height (int): Alto solicitado.
+
+    Returns:
+        Any: Objeto con la interfaz de ``cv2.VideoCapture``.
+    """
+    if source == "synthetic":
+        return SyntheticCapture(width=width, height=height)
+    if isinstance(source, str) and source.isdigit():
+        source = int(source)
+    cap = cv2.VideoCapture(source)
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    return cap
+
+
+def summarize_latencies(camera_id: int, source: Any, latencies: Sequence[float], elapsed: float) -> Dict[str, Any]:
+    """
+    Resume las métricas de un worker.
+
+    Args:
+        camera_id (int): Índice de la cámara.
+        source (Any): Fuente de video.
+        latencies (Sequence[float]): Latencia de procesamiento de cada frame (segundos).
+        elapsed (float): Tiempo total de ejecución del worker (segundos).
+
+    Returns:
+        Dict[str, Any]: Frames, FPS y latencias media, p95 y máxima en milisegundos.
+    """
+    latencies_ms = np.asarray(latencies, dtype=np.float64) * 1000.0
+    frames = len(latencies_ms)
+    return {
+        "camera_id": camera_id,
+        "source": str(source),
+        "frames": frames,
+        "fps": frames / elapsed if elapsed > 0 else 0.0,
+        "latency_mean_ms": float(latencies_ms.mean()) if frames else 0.0,
+        "latency_p95_ms": float(np.percentile(latencies_ms, 95)) if frames else 0.0,
+        "latency_max_ms": float(latencies_ms.max()) if frames else 0.0,
+    }
+
+
+def camera_worker(
+    camera_id: int,
+    source: Union[int, str],
+    store: Union[SharedImageStore, Tuple[str, StoreIndex]],
+    results: Any,
+    stop_event: Any,
+    duration: float,
+    enable_hand_detection: bool = constants.ENABLE_HAND_DETECTION,
+    width: int = constants.CAMERA_WIDTH,
+    height: int = constants.CAMERA_HEIGHT,
+    bus_name: Optional[str] = None
+) -> None:
+    """
+    Bucle de una cámara: captura, procesa con su propio ``ARPipeline`` y publica sus métricas.
+
+    Args:
+        camera_id (int): Índice de la cámara.
+        source (Union[int, str]): Fuente de video.
+        store (Union[SharedImageStore, Tuple[str, StoreIndex]]): Almacén compartido (hilos) o su
+            descriptor (procesos).
+        results (Any): Cola donde se deposita el resumen al terminar.
+        stop_event (Any): Evento para detener el worker antes de ``duration``.
+        duration (float): Tiempo máximo de ejecución (segundos).
+        enable_hand_detection (bool): Flag para habilitar la detección de manos.
+        width (int): Ancho solicitado a la cámara.
+        height (int): Alto solicitado a la cámara.
+        bus_name (Optional[str]): Nombre del bus de frames donde publicar (None para no publicar).
+    """
+    # Importación diferida: en modo proceso, MediaPipe se inicializa dentro del worker
+    from ar_pipeline import ARPipeline
+
+    attached = SharedImageStore.attach(store) if isinstance(store, tuple) else None
+    images = attached.images if attached is not None else store.images
+
+    cap: Any = None
+    pipeline: Optional[ARPipeline] = None
+    latencies: List[float] = []
+    frame_bus: Optional[FrameBusPublisher] = None
+
+    start = time.perf_counter()
+    try:
+        # Dentro del try: si la cámara o el pipeline fallan, el almacén se cierra igualmente y
+        # el proceso principal recibe un resumen (vacío) en lugar de esperarlo hasta el timeout
+        cap = open_capture(source, width, height)
+        pipeline = ARPipeline(images, enable_hand_detection=enable_hand_detection, frame_width=width, frame_height=height)
+        start = time.perf_counter()
+        while not stop_event.is_set() and time.perf_counter() - start < duration:
+            ret, frame = cap.read()
+            if not ret:
+                logger.error(f"Error al capturar el frame de la cámara {camera_id} ({source}).")
+                break
+            frame_start = time.perf_counter()
+            frame = pipeline.process(frame)
+            if bus_name is not None:
+                if frame_bus is None:
+                    frame_bus = FrameBusPublisher(bus_name, frame.shape[1], frame.shape[0],
+                                                  slots=constants.FRAME_BUS_SLOTS)
+                metadata = build_frame_metadata(pipeline.current_markers, pipeline.landmark_list, len(latencies))
+                frame_bus.publish(frame, metadata)
+            latencies.append(time.perf_counter() - frame_start)
+    finally:
+        elapsed = time.perf_counter() - start
+        if cap is not None:
+            cap.release()
+        if frame_bus is not None:
+            frame_bus.close()
+        del pipeline, images
+        if attached is not None:
+            attached.close()
+        results.put(summarize_latencies(camera_id, source, latencies, elapsed))
+
+
+def join_workers(workers: Sequence[Any], timeout: Optional[float] = None) -> List[Any]:
+    """
+    Espera a los workers como mucho ``timeout`` segundos en total. Los procesos que siguen vivos
+    se terminan; los hilos (daemon) se abandonan, porque no se pueden interrumpir.
+
+    Args:
+        workers (Sequence[Any]): Hilos o procesos lanzados.
+        timeout (Optional[float]): Tiempo máximo total de espera (None para esperar sin límite).
+
+    Returns:
+        List[Any]: Workers que no terminaron a tiempo.
+    """
+    deadline = time.perf_counter() + timeout if timeout is not None else None
+    stragglers = []
+    for worker in workers:
+        worker.join(None if deadline is None else max(deadline - time.perf_counter(), 0.0))
+        if worker.is_alive():
+            stragglers.append(worker)
+            if isinstance(worker, multiprocessing.process.BaseProcess):
+                worker.terminate()
+                worker.join(1.0)
+    return stragglers
+
+
+class MultiCameraRuntime:
+    """
+    Clase que lanza un worker por fuente de video y recoge sus métricas.
+    """
+
+    def __init__(
+        self,
+        sources: Sequence[Union[int, str]],
+        augmented_images: Mapping[int, np.ndarray],
+        mode: str = "process",
+        enable_hand_detection: bool = constants.ENABLE_HAND_DETECTION,
+        width: int = constants.CAMERA_WIDTH,
+        height: int = constants.CAMERA_HEIGHT,
+        bus_prefix: Optional[str] = None
+    ) -> None:
+        if mode not in ("process", "thread"):
+            raise ValueError(f"Modo de ejecución desconocido: {mode}")
+        self.sources: List[Union[int, str]] = list(sources)
+        self.augmented_images: Mapping[int, np.ndarray] = augmented_images
+        self.mode: str = mode
+        self.enable_hand_detection: bool = enable_hand_detection
+        self.width: int = width
+        self.height: int = height
+        self.bus_prefix: Optional[str] = bus_prefix
+
+    def run(self, duration: float) -> Tuple[List[Dict[str, Any]], float]:
+        """
+        Ejecuta todas las cámaras en paralelo durante ``duration`` segundos.
+
+        Args:
+            duration (float): Tiempo de ejecución de cada worker (segundos).
+
+        Returns:
+            Tuple[List[Dict[str, Any]], float]: Resumen por cámara y tiempo total de pared.
+        """
+        store = SharedImageStore.create(self.augmented_images)
+        workers: List[Union[threading.Thread, multiprocessing.Process]] = []
+        try:
+            if self.mode == "process":
+                # "spawn" evita heredar el estado de OpenCV/MediaPipe del proceso padre
+                context = multiprocessing.get_context("spawn")
+                results: Any = context.Queue()
+                stop_event: Any = context.Event()
+                worker_store: Any = store.descriptor()
+                worker_cls: Any = context.Process
+            else:
+                results = queue.Queue()
+                stop_event = threading.Event()
+                worker_store = store
+                worker_cls = threading.Thread
+
+            for camera_id, source in enumerate(self.sources):
+                bus_name = f"{self.bus_prefix}_{camera_id}" if self.bus_prefix else None
+                workers.append(worker_cls(
+                    target=camera_worker,
+                    args=(camera_id, source, worker_store, results, stop_event, duration,
+                          self.enable_hand_detection, self.width, self.height, bus_name),
+                    daemon=True
+                ))
+
+            start = time.perf_counter()
+            for worker in workers:
+                worker.start()
+
+            reports: List[Dict[str, Any]] = []
+            deadline: Optional[float] = None
+            try:
+                while len(reports) < len(workers):
+                    try:
+                        reports.append(results.get(timeout=1.0))
+                    except queue.Empty:
+                        if not any(worker.is_alive() for worker in workers):
+                            break
+            except KeyboardInterrupt:
+                stop_event.set()
+                deadline = time.perf_counter() + duration + 30
+                while len(reports) < len(workers) and time.perf_counter() < deadline:
+                    try:
+                        reports.append(results.get(timeout=1.0))
+                    except queue.Empty:
+                        if not any(worker.is_alive() for worker in workers):
+                            break
+            wall_time = time.perf_counter() - start
+
+            # Tras una interrupción, un worker bloqueado (por ejemplo en cap.read() de una fuente
+            # RTSP caída) no debe colgar el proceso: se espera solo hasta el plazo
+            stragglers = join_workers(workers, None if deadline is None else deadline - time.perf_counter())
+            for worker in stragglers:
+                logger.warning(f"El worker {worker.name} no terminó a tiempo y se abandona.")
+        finally:
+            store.close()
+
+        reports.sort(key=lambda report: report["camera_id"])
+        return reports, wall_time
+
+
+def format_report(reports: Sequence[Dict[str, Any]], wall_time: float) -> str:
+    """
+    Genera una tabla de texto con las métricas por cámara y el total.
+
+    Args:
+        reports (Sequence[Dict[str, Any]]): Resúmenes por cámara.
+        wall_time (float): Tiempo total de pared (segundos).
+
+    Returns:
+        str: Tabla formateada.
+    """
+    lines = [f"{'cam':>3}  {'fuente':<12} {'frames':>7} {'fps':>8} {'lat media':>10} {'lat p95':>9} {'lat max':>9}"]
+    for report in reports:
+        lines.append(
+            f"{report['camera_id']:>3}  {report['source'][:12]:<12} {report['frames']:>7} {report['fps']:>8.1f} "
+            f"{report['latency_mean_ms']:>8.1f}ms {report['latency_p95_ms']:>7.1f}ms {report['latency_max_ms']:>7.1f}ms"
+        )
+    total_frames = sum(report["frames"] for report in reports)
+    total_fps = sum(report["fps"] for report in reports)
+    lines.append(f"total: {len(reports)} cámaras, {total_frames} frames, {total_fps:.1f} fps agregados, {wall_time:.1f}s")
+    return "\n".join(lines)
+
+
+def run_scaling(
+    max_cameras: int,
+    augmented_images: Mapping[int, np.ndarray],
+    mode: str,
+    duration: float,
+    enable_hand_detection: bool
+) -> str:
+    """
+    Ejecuta de 1 a ``max_cameras`` cámaras sintéticas y tabula cómo escala el rendimiento agregado.
+
+    Args:
+        max_cameras (int): Número máximo de cámaras.
+        augmented_images (Mapping[int, np.ndarray]): Imágenes aumentadas por ID.
+        mode (str): "process" o "thread".
+        duration (float): Duración de cada ejecución (segundos).
+        enable_hand_detection (bool): Flag para habilitar la detección de manos.
+
+    Returns:
+        str: Tabla de escalado (cámaras, fps agregados, fps por cámara, aceleración, eficiencia).
+    """
+    lines = [f"núcleos disponibles: {os.cpu_count()}  modo: {mode}",
+             f"{'cámaras':>7} {'fps total':>10} {'fps/cámara':>11} {'p95 ms':>8} {'aceleración':>12} {'eficiencia':>11}"]
+    base_fps: Optional[float] = None
+    for num_cameras in range(1, max_cameras + 1):
+        runtime = MultiCameraRuntime(["synthetic"] * num_cameras, augmented_images, mode=mode,
+                                     enable_hand_detection=enable_hand_detection)
+        reports, _ = runtime.run(duration)
+        total_fps = sum(report["fps"] for report in reports)
+        p95 = max(report["latency_p95_ms"] for report in reports)
+        base_fps = base_fps or total_fps
+        speedup = total_fps / base_fps if base_fps else 0.0
+        lines.append(
+            f"{num_cameras:>7} {total_fps:>10.1f} {total_fps / num_cameras:>11.1f} {p95:>8.1f} "
+            f"{speedup:>11.2f}x {speedup / num_cameras:>10.0%}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    """
+    Punto de entrada por línea de comandos.
+    """
+    parser = argparse.ArgumentParser(description="Realidad aumentada sobre varias cámaras en paralelo.")
+    parser.add_argument("--sources", nargs="+", default=["0"],
+                        help="Índices de cámara, rutas/URLs de video o 'synthetic'.")
+    parser.add_argument("--mode", choices=("process", "thread"), default="process",
+                        help="Ejecutar cada cámara en un proceso o en un hilo.")
+    parser.add_argument("--duration", type=float, default=30.0, help="Duración en segundos.")
+    parser.add_argument("--no-hands", action="store_true", help="Deshabilitar la detección de manos.")
+    parser.add_argument("--scaling", type=int, default=0,
+                        help="Medir el escalado con 1..N cámaras sintéticas en lugar de --sources.")
+    parser.add_argument("--bus-prefix", default=None,
+                        help="Publicar los frames de cada cámara en el bus <prefijo>_<cámara>.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    augmented_images = load_augmented_images(constants.AUGMENTED_MARKERS_PATH)
+    enable_hands = constants.ENABLE_HAND_DETECTION and not args.no_hands
+
+    if args.scaling > 0:
+        print(run_scaling(args.scaling, augmented_images, args.mode, args.duration, enable_hands))
+        return
+
+    runtime = MultiCameraRuntime(args.sources, augmented_images, mode=args.mode, enable_hand_detection=enable_hands,
+                                 bus_prefix=args.bus_prefix)
+    reports, wall_time = runtime.run(args.duration)
+    print(format_report(reports, wall_time))
+
+
+if __name__ == "__main__":
+    main()
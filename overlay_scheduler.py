@@ -0,0 +1,339 @@
+"""
+Módulo para planificar la superposición de contenido según el tamaño proyectado de cada marcador.
+
+Deformar el contenido completo de todos los marcadores en cada frame hace que el tiempo por frame
+crezca con el número de marcadores, aunque muchos ocupen unos pocos píxeles o estén casi fuera del
+frame. ``OverlayScheduler`` calcula el área proyectada y la fracción visible de cada marcador a
+partir de sus esquinas y decide cómo dibujarlo:
+
+- ``culled``: demasiado pequeño o fuera del frame, no se dibuja.
+- ``approximate``: pequeño o casi fuera del frame, se rellena con el color medio del contenido.
+- ``reused``: el marcador apenas cambió de forma (como mucho se desplazó) y el contenido no cambió
+  (o es un marcador lejano que aún no toca refrescar), se vuelve a componer la deformación anterior,
+  desplazada un número entero de píxeles si hace falta.
+- ``full``: se deforma el contenido.
+
+Todas las acciones que dibujan algo consumen un presupuesto por frame, repartido empezando por los
+marcadores más grandes (más cercanos). Cuando ya no queda presupuesto para la acción preferida de un
+marcador, se usa la siguiente más barata (``full`` -> ``reused`` -> ``approximate`` -> ``culled``),
+de modo que el tiempo de composición deja de crecer con el número de marcadores.
+"""
+
+import cv2
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from augment_markers import warp_overlay, composite_overlay, draw_marker_id
+from constants import (
+    OVERLAY_MIN_AREA,
+    OVERLAY_APPROX_AREA,
+    OVERLAY_NEAR_AREA,
+    OVERLAY_LABEL_MIN_AREA,
+    OVERLAY_MIN_VISIBLE_FRACTION,
+    OVERLAY_FAR_REFRESH_INTERVAL,
+    OVERLAY_REUSE_TOLERANCE,
+    OVERLAY_FRAME_BUDGET,
+    OVERLAY_REUSE_COST,
+    OVERLAY_APPROX_COST,
+    OVERLAY_MARKER_COST,
+)
+
+# Acciones posibles para cada marcador
+CULLED: str = "culled"
+APPROXIMATE: str = "approximate"
+REUSED: str = "reused"
+FULL: str = "full"
+
+
+def quad_area(corners: np.ndarray) -> np.ndarray:
+    """
+    Calcula el área de uno o varios cuadriláteros con la fórmula del área de Gauss.
+
+    Args:
+        corners (np.ndarray): Esquinas (..., 4, 2) en orden.
+
+    Returns:
+        np.ndarray: Área en píxeles² de cada cuadrilátero.
+    """
+    x, y = corners[..., 0].astype(np.float64), corners[..., 1].astype(np.float64)
+    following = [1, 2, 3, 0]
+    return 0.5 * np.abs(np.sum(x * y[..., following] - y * x[..., following], axis=-1))
+
+
+def clipped_box_area(corners: np.ndarray, width: int, height: int) -> np.ndarray:
+    """
+    Calcula el área de la caja envolvente de cada marcador que queda dentro del frame.
+
+    Args:
+        corners (np.ndarray): Esquinas (..., 4, 2).
+        width (int): Ancho del frame.
+        height (int): Alto del frame.
+
+    Returns:
+        np.ndarray: Área en píxeles².
+    """
+    low = np.maximum(corners.min(axis=-2), 0.0)
+    high = np.minimum(corners.max(axis=-2), (width, height))
+    return np.prod(np.clip(high - low, 0.0, None), axis=-1)
+
+
+def visible_fraction(corners: np.ndarray, width: int, height: int) -> np.ndarray:
+    """
+    Aproxima la fracción visible de cada marcador con la de su caja envolvente.
+
+    Args:
+        corners (np.ndarray): Esquinas (..., 4, 2).
+        width (int): Ancho del frame.
+        height (int): Alto del frame.
+
+    Returns:
+        np.ndarray: Fracción entre 0 (fuera del frame) y 1 (completamente dentro).
+    """
+    box_area = np.prod(corners.max(axis=-2) - corners.min(axis=-2), axis=-1)
+    return np.where(box_area > 0.0, clipped_box_area(corners, width, height) / np.maximum(box_area, 1e-9), 0.0)
+
+
+class CachedOverlay:
+    """
+    Última deformación completa de un marcador, para reutilizarla mientras siga siendo válida.
+    """
+
+    def __init__(self, corners: np.ndarray, origin: Tuple[int, int], patch: np.ndarray,
+                 content: np.ndarray, refreshed_at: int) -> None:
+        self.corners: np.ndarray = corners
+        self.origin: Tuple[int, int] = origin
+        self.patch: np.ndarray = patch
+        self.content: np.ndarray = content
+        self.refreshed_at: int = refreshed_at
+        # Solo se puede desplazar una deformación que no quedó recortada por el borde del frame
+        x0, y0 = np.floor(corners.min(axis=0)).astype(int)
+        x1, y1 = np.ceil(corners.max(axis=0)).astype(int) + 1
+        self.complete: bool = origin == (x0, y0) and patch.shape[:2] == (y1 - y0, x1 - x0)
+
+    def shift_to(self, corners: np.ndarray, tolerance: float) -> Optional[Tuple[int, int]]:
+        """
+        Calcula el desplazamiento entero que lleva la deformación guardada a las esquinas actuales.
+
+        Args:
+            corners (np.ndarray): Esquinas actuales (4x2).
+            tolerance (float): Diferencia máxima admitida por esquina tras el desplazamiento, en píxeles.
+
+        Returns:
+            Optional[Tuple[int, int]]: Desplazamiento (dx, dy), o None si la forma cambió demasiado.
+        """
+        difference = corners - self.corners
+        offset = np.rint(difference.sum(axis=0) * 0.25) if self.complete else np.zeros(2, dtype=np.float32)
+        if float(np.abs(difference - offset).max()) > tolerance:
+            return None
+        return int(offset[0]), int(offset[1])
+
+
+class OverlayDecision:
+    """
+    Decisión del planificador para un marcador en el frame actual.
+    """
+
+    def __init__(self, key: Tuple[int, int], marker_id: int, corners: np.ndarray, area: float,
+                 visible: float, warp_cost: float) -> None:
+        self.key: Tuple[int, int] = key
+        self.marker_id: int = marker_id
+        self.corners: np.ndarray = corners
+        self.area: float = area
+        self.visible: float = visible
+        self.warp_cost: float = warp_cost
+        self.action: str = CULLED
+        self.shift: Tuple[int, int] = (0, 0)
+        self.draw_label: bool = False
+        self.content: Optional[np.ndarray] = None
+
+
+class OverlayScheduler:
+    """
+    Clase que decide, marcador a marcador, cómo superponer el contenido en cada frame.
+    """
+
+    def __init__(
+        self,
+        min_area: float = OVERLAY_MIN_AREA,
+        approx_area: float = OVERLAY_APPROX_AREA,
+        near_area: float = OVERLAY_NEAR_AREA,
+        label_min_area: float = OVERLAY_LABEL_MIN_AREA,
+        min_visible_fraction: float = OVERLAY_MIN_VISIBLE_FRACTION,
+        far_refresh_interval: int = OVERLAY_FAR_REFRESH_INTERVAL,
+        reuse_tolerance: float = OVERLAY_REUSE_TOLERANCE,
+        frame_budget: float = OVERLAY_FRAME_BUDGET,
+        reuse_cost: float = OVERLAY_REUSE_COST,
+        approx_cost: float = OVERLAY_APPROX_COST,
+        marker_cost: float = OVERLAY_MARKER_COST
+    ) -> None:
+        self.min_area: float = min_area
+        self.approx_area: float = approx_area
+        self.near_area: float = near_area
+        self.label_min_area: float = label_min_area
+        self.min_visible_fraction: float = min_visible_fraction
+        self.far_refresh_interval: int = far_refresh_interval
+        self.reuse_tolerance: float = reuse_tolerance
+        self.frame_budget: float = frame_budget
+        self.reuse_cost: float = reuse_cost
+        self.approx_cost: float = approx_cost
+        self.marker_cost: float = marker_cost
+
+        self.frame_index: int = 0
+        self.cache: Dict[Tuple[int, int], CachedOverlay] = {}
+        self.mean_colors: Dict[Tuple[int, int], Tuple[np.ndarray, Tuple[float, ...]]] = {}
+        self.last_decisions: List[OverlayDecision] = []
+
+    def plan(
+        self,
+        markers: Sequence[Tuple[int, Any]],
+        frame_shape: Tuple[int, ...],
+        get_content: Callable[[int], Optional[np.ndarray]]
+    ) -> List[OverlayDecision]:
+        """
+        Decide la acción de cada marcador del frame.
+
+        Args:
+            markers (Sequence[Tuple[int, Any]]): ID y coordenadas de cada marcador, en orden de dibujo.
+            frame_shape (Tuple[int, ...]): Dimensiones del frame.
+            get_content (Callable[[int], Optional[np.ndarray]]): Devuelve el contenido de un ID; solo
+                se llama para los marcadores que se van a dibujar.
+
+        Returns:
+            List[OverlayDecision]: Decisiones en el mismo orden que ``markers``.
+        """
+        self.frame_index += 1
+        height, width = frame_shape[:2]
+        budget = self.frame_budget * width * height
+
+        decisions: List[OverlayDecision] = []
+        if markers:
+            # Geometría de todos los marcadores a la vez
+            all_corners = np.stack([np.asarray(bbox, dtype=np.float32).reshape(4, 2) for _, bbox in markers])
+            areas = quad_area(all_corners).tolist()
+            visible = visible_fraction(all_corners, width, height).tolist()
+            warp_costs = clipped_box_area(all_corners, width, height).tolist()
+            occurrences: Dict[int, int] = {}
+            for index, (marker_id, _) in enumerate(markers):
+                # Un mismo ID puede aparecer varias veces (detectado y fijado)
+                occurrence = occurrences.get(marker_id, 0)
+                occurrences[marker_id] = occurrence + 1
+                decisions.append(OverlayDecision(
+                    (marker_id, occurrence), marker_id, all_corners[index], areas[index], visible[index], warp_costs[index]
+                ))
+
+        # Los marcadores más cercanos (mayor área proyectada) tienen prioridad en el presupuesto; el
+        # primero que se dibuja recibe siempre su acción preferida
+        used = 0.0
+        for decision in sorted(decisions, key=lambda d: d.area, reverse=True):
+            # Sin presupuesto ni para el marcador más barato, el resto no se dibuja
+            if used > 0.0 and used + self.marker_cost > budget:
+                break
+            if decision.area < self.min_area or decision.visible <= 0.0:
+                continue
+            # Sin presupuesto ni para una aproximación, el contenido ni siquiera se pide
+            if used > 0.0 and used + self._cost(APPROXIMATE, decision) > budget:
+                continue
+            decision.content = get_content(decision.marker_id)
+            if decision.content is None:
+                continue
+
+            if decision.area < self.approx_area or decision.visible < self.min_visible_fraction:
+                candidates = [APPROXIMATE]
+            else:
+                cached = self.cache.get(decision.key)
+                shift = cached.shift_to(decision.corners, self.reuse_tolerance) if cached is not None else None
+                still = shift is not None
+                if still:
+                    decision.shift = shift
+                far_and_fresh = decision.area < self.near_area and cached is not None \
+                    and self.frame_index - cached.refreshed_at < self.far_refresh_interval
+                if still and (cached.content is decision.content or far_and_fresh):
+                    candidates = [REUSED, APPROXIMATE]
+                elif still:
+                    # Fuera de presupuesto: contenido desactualizado si solo se desplazó
+                    candidates = [FULL, REUSED, APPROXIMATE]
+                else:
+                    candidates = [FULL, APPROXIMATE]
+
+            for action in candidates:
+                cost = self._cost(action, decision)
+                if used == 0.0 or used + cost <= budget:
+                    decision.action = action
+                    used += cost
+                    break
+            # La etiqueta se dibuja solo si cabe en el presupuesto (cuesta como un marcador)
+            if decision.action in (FULL, REUSED) and decision.area >= self.label_min_area \
+                    and used + self.marker_cost <= budget:
+                decision.draw_label = True
+                used += self.marker_cost
+
+        # Olvidar los marcadores que ya no aparecen
+        keys = {decision.key for decision in decisions}
+        for cache in (self.cache, self.mean_colors):
+            for key in [key for key in cache if key not in keys]:
+                del cache[key]
+
+        self.last_decisions = decisions
+        return decisions
+
+    def composite(
+        self,
+        frame: np.ndarray,
+        markers: Sequence[Tuple[int, Any]],
+        get_content: Callable[[int], Optional[np.ndarray]]
+    ) -> np.ndarray:
+        """
+        Planifica y superpone el contenido de los marcadores sobre el frame.
+
+        Args:
+            frame (np.ndarray): Frame sobre el que superponer (se modifica en el sitio).
+            markers (Sequence[Tuple[int, Any]]): ID y coordenadas de cada marcador, en orden de dibujo.
+            get_content (Callable[[int], Optional[np.ndarray]]): Devuelve el contenido de un ID.
+
+        Returns:
+            np.ndarray: Frame con las superposiciones.
+        """
+        for decision in self.plan(markers, frame.shape, get_content):
+            if decision.action == CULLED:
+                continue
+            if decision.action == APPROXIMATE:
+                cv2.fillConvexPoly(frame, decision.corners.astype(int), self._mean_color(decision))
+                continue
+            if decision.action == FULL:
+                warped = warp_overlay(decision.corners, decision.content, frame.shape)
+                if warped is None:
+                    continue
+                self.cache[decision.key] = CachedOverlay(
+                    decision.corners.copy(), warped[0], warped[1], decision.content, self.frame_index
+                )
+                decision.shift = (0, 0)
+            cached = self.cache[decision.key]
+            dx, dy = decision.shift
+            composite_overlay(frame, cached.corners + np.float32((dx, dy)), (cached.origin[0] + dx, cached.origin[1] + dy), cached.patch)
+            if decision.draw_label:
+                draw_marker_id(frame, decision.corners, decision.marker_id)
+        return frame
+
+    def _cost(self, action: str, decision: OverlayDecision) -> float:
+        """
+        Estima el coste de dibujar un marcador con una acción, en píxeles deformados equivalentes.
+
+        Args:
+            action (str): Acción (``full``, ``reused`` o ``approximate``).
+            decision (OverlayDecision): Decisión del marcador, con su área dentro del frame.
+
+        Returns:
+            float: Coste estimado.
+        """
+        factor = {FULL: 1.0, REUSED: self.reuse_cost, APPROXIMATE: self.approx_cost}[action]
+        return decision.warp_cost * factor + self.marker_cost
+
+    def _mean_color(self, decision: OverlayDecision) -> Tuple[float, ...]:
+        """
+        Devuelve el color medio del contenido, calculado solo cuando el contenido cambia.
+        """
+        cached = self.mean_colors.get(decision.key)
+        if cached is None or cached[0] is not decision.content:
+            cached = (decision.content, tuple(cv2.mean(decision.content)[:3]))
+            self.mean_colors[decision.key] = cached
+        return cached[1]
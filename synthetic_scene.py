@@ -0,0 +1,187 @@
+"""
+Módulo para generar escenas sintéticas con marcadores ArUco.
+
+Se utiliza como fuente de video sin cámara (benchmarks, pruebas y ejecución en servidores) y
+como conjunto de datos etiquetado: cada escena devuelve las esquinas reales de cada marcador.
+"""
+
+import time
+import cv2
+import cv2.aruco as aruco
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from constants import ARUCO_DICT
+
+# Margen blanco (en módulos del marcador) alrededor de cada marcador renderizado
+QUIET_ZONE_MODULES: int = 1
+
+
+def generate_marker_image(marker_id: int, side_px: int, aruco_dict: int = ARUCO_DICT) -> np.ndarray:
+    """
+    Genera la imagen en escala de grises de un marcador con su zona blanca alrededor.
+
+    Args:
+        marker_id (int): ID del marcador dentro del diccionario.
+        side_px (int): Lado del marcador en píxeles (sin la zona blanca).
+        aruco_dict (int): Diccionario ArUco predefinido.
+
+    Returns:
+        np.ndarray: Imagen del marcador con la zona blanca.
+    """
+    dictionary = aruco.getPredefinedDictionary(aruco_dict)
+    marker = aruco.generateImageMarker(dictionary, marker_id, side_px)
+    modules = dictionary.markerSize + 2
+    quiet_zone = max(1, side_px * QUIET_ZONE_MODULES // modules)
+    return cv2.copyMakeBorder(marker, quiet_zone, quiet_zone, quiet_zone, quiet_zone, cv2.BORDER_CONSTANT, value=255)
+
+
+def render_marker_scene(
+    width: int,
+    height: int,
+    marker_ids: Sequence[int],
+    marker_size_range: Tuple[int, int] = (60, 120),
+    max_rotation: float = 30.0,
+    perspective_jitter: float = 0.05,
+    noise_sigma: float = 0.0,
+    blur_kernel: int = 0,
+    brightness: float = 1.0,
+    seed: Optional[int] = None,
+    aruco_dict: int = ARUCO_DICT
+) -> Tuple[np.ndarray, Dict[int, np.ndarray]]:
+    """
+    Renderiza una escena BGR con los marcadores indicados en posiciones aleatorias sin solaparse.
+
+    Args:
+        width (int): Ancho de la escena.
+        height (int): Alto de la escena.
+        marker_ids (Sequence[int]): IDs de los marcadores a colocar.
+        marker_size_range (Tuple[int, int]): Lado mínimo y máximo de cada marcador en píxeles.
+        max_rotation (float): Rotación máxima en el plano (grados).
+        perspective_jitter (float): Desplazamiento aleatorio de las esquinas, relativo al lado.
+        noise_sigma (float): Desviación estándar del ruido gaussiano.
+        blur_kernel (int): Tamaño del kernel de desenfoque gaussiano (0 para desactivarlo).
+        brightness (float): Factor de brillo aplicado a la escena.
+        seed (Optional[int]): Semilla para reproducir la escena.
+        aruco_dict (int): Diccionario ArUco predefinido.
+
+    Returns:
+        Tuple[np.ndarray, Dict[int, np.ndarray]]:
+            - Escena BGR.
+            - Diccionario con el ID de cada marcador colocado y sus 4 esquinas (4x2, float32),
+              en el mismo orden que devuelve el detector.
+    """
+    rng = np.random.default_rng(seed)
+    # Fondo gris con gradiente suave para que la umbralización no sea trivial
+    gradient = np.linspace(150, 210, width, dtype=np.float32)
+    scene = np.tile(gradient, (height, 1))
+    corners: Dict[int, np.ndarray] = {}
+
+    # Dividir la escena en celdas para colocar los marcadores sin solaparse
+    max_side = marker_size_range[1]
+    cell = int(max_side * 1.6)
+    cols, rows = max(1, width // cell), max(1, height // cell)
+    cells = rng.permutation(cols * rows)
+
+    for marker_id, cell_idx in zip(marker_ids, cells):
+        side = int(rng.integers(marker_size_range[0], marker_size_range[1] + 1))
+        patch = generate_marker_image(int(marker_id), side, aruco_dict).astype(np.float32)
+        quiet_zone = (patch.shape[0] - side) // 2
+        patch_side = patch.shape[0]
+
+        # Centro de la celda con un pequeño desplazamiento aleatorio
+        col, row = cell_idx % cols, cell_idx // cols
+        slack = max(0.0, (cell - patch_side * 1.42) / 2)
+        center = np.array([
+            col * cell + cell / 2 + rng.uniform(-slack, slack),
+            row * cell + cell / 2 + rng.uniform(-slack, slack)
+        ])
+
+        # Esquinas destino del parche: rotación más perturbación de perspectiva
+        angle = np.deg2rad(rng.uniform(-max_rotation, max_rotation))
+        rotation = np.array([[np.cos(angle), -np.sin(angle)], [np.sin(angle), np.cos(angle)]])
+        half = patch_side / 2
+        square = np.array([[-half, -half], [half, -half], [half, half], [-half, half]])
+        jitter = rng.uniform(-perspective_jitter, perspective_jitter, (4, 2)) * side
+        dst = (square @ rotation.T + center + jitter).astype(np.float32)
+        src = np.float32([[0, 0], [patch_side, 0], [patch_side, patch_side], [0, patch_side]])
+        matrix = cv2.getPerspectiveTransform(src, dst)
+
+        warped = cv2.warpPerspective(patch, matrix, (width, height), flags=cv2.INTER_LINEAR)
+        mask = cv2.warpPerspective(np.ones_like(patch), matrix, (width, height), flags=cv2.INTER_LINEAR)
+        scene = scene * (1 - mask) + warped
+
+        # Esquinas reales del marcador (borde exterior negro)
+        marker_src = np.float32([
+            [quiet_zone, quiet_zone],
+            [quiet_zone + side, quiet_zone],
+            [quiet_zone + side, quiet_zone + side],
+            [quiet_zone, quiet_zone + side]
+        ]).reshape(-1, 1, 2)
+        # Las coordenadas de píxel de OpenCV se refieren al centro del píxel
+        corners[int(marker_id)] = cv2.perspectiveTransform(marker_src, matrix).reshape(4, 2) - 0.5
+
+    scene = scene * brightness
+    if blur_kernel > 0:
+        kernel = blur_kernel | 1
+        scene = cv2.GaussianBlur(scene, (kernel, kernel), 0)
+    if noise_sigma > 0:
+        scene = scene + rng.normal(0, noise_sigma, scene.shape)
+
+    gray = np.clip(scene, 0, 255).astype(np.uint8)
+    return cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR), corners
+
+
+class SyntheticCapture:
+    """
+    Fuente de video sintética con la misma interfaz básica que ``cv2.VideoCapture``.
+
+    Pre-renderiza un ciclo corto de escenas y lo reproduce, opcionalmente limitado a ``fps``.
+    """
+
+    def __init__(
+        self,
+        width: int = 800,
+        height: int = 600,
+        marker_ids: Sequence[int] = (0, 1, 2, 4),
+        num_frames: int = 8,
+        fps: float = 0.0,
+        seed: int = 0
+    ) -> None:
+        self.width: int = width
+        self.height: int = height
+        self.fps: float = fps
+        self.frames: List[np.ndarray] = [
+            render_marker_scene(width, height, marker_ids, seed=seed + idx)[0] for idx in range(num_frames)
+        ]
+        self.frame_index: int = 0
+        self.last_read: float = 0.0
+        self.opened: bool = True
+
+    def isOpened(self) -> bool:
+        return self.opened
+
+    def set(self, prop_id: int, value: float) -> bool:
+        # El tamaño del frame se fija en el constructor
+        return False
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Devuelve el siguiente frame del ciclo (una copia, como hace una cámara real).
+
+        Returns:
+            Tuple[bool, Optional[np.ndarray]]: Flag de éxito y frame.
+        """
+        if not self.opened:
+            return False, None
+        if self.fps > 0:
+            wait = self.last_read + 1.0 / self.fps - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+            self.last_read = time.perf_counter()
+        frame = self.frames[self.frame_index % len(self.frames)].copy()
+        self.frame_index += 1
+        return True, frame
+
+    def release(self) -> None:
+        self.opened = False
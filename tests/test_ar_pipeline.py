@@ -0,0 +1,70 @@
+"""
+Unit tests for the ar_pipeline module.
+"""
+
+import unittest
+import numpy as np
+
+from ar_pipeline import ARPipeline
+from media_source import MediaSource
+from synthetic_scene import render_marker_scene
+
+
+class FakeMediaSource(MediaSource):
+    def __init__(self) -> None:
+        self.visible = False
+        self.frames_served = 0
+
+    def current_frame(self) -> np.ndarray:
+        self.frames_served += 1
+        return np.full((40, 40, 3), 128, dtype=np.uint8)
+
+    def set_visible(self, visible: bool) -> None:
+        self.visible = visible
+
+
+class TestARPipeline(unittest.TestCase):
+    def setUp(self) -> None:
+        augmented_images = {1: np.full((50, 50, 3), 255, dtype=np.uint8)}
+        self.pipeline = ARPipeline(augmented_images, enable_hand_detection=False, show_rectangles=False)
+
+    def test_process_detects_markers(self) -> None:
+        # Markers rendered in a synthetic scene are detected and kept as current markers
+        frame, corners = render_marker_scene(640, 480, [1, 2], seed=0)
+        result = self.pipeline.process(frame)
+        self.assertEqual(result.shape, frame.shape)
+        detected_ids = sorted(int(marker_id) for marker_id in self.pipeline.current_markers[1].flatten())
+        self.assertEqual(detected_ids, sorted(corners))
+
+    def test_overlay_with_and_without_scheduler(self) -> None:
+        # The marker is covered by its (white) content whether or not the overlay scheduler is used
+        frame, corners = render_marker_scene(640, 480, [1], seed=0)
+        center_x, center_y = corners[1].mean(axis=0).astype(int)
+        for enable_overlay_scheduler in (True, False):
+            pipeline = ARPipeline(
+                self.pipeline.augmented_images, enable_hand_detection=False, show_rectangles=False,
+                enable_overlay_scheduler=enable_overlay_scheduler
+            )
+            result = pipeline.process(frame.copy())
+            self.assertTrue((result[center_y - 5:center_y + 5, center_x - 5:center_x + 5] == 255).all())
+
+    def test_process_blank_frame(self) -> None:
+        blank_frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        result = self.pipeline.process(blank_frame)
+        self.assertIsInstance(result, np.ndarray)
+        self.assertIsNone(self.pipeline.marker_cache.cached_markers)
+
+    def test_media_sources_follow_visibility(self) -> None:
+        # Only the media of detected markers is marked visible and composited
+        media_sources = {2: FakeMediaSource(), 4: FakeMediaSource()}
+        pipeline = ARPipeline({}, enable_hand_detection=False, show_rectangles=False, media_sources=media_sources)
+        frame, _ = render_marker_scene(640, 480, [1, 2], seed=0)
+        pipeline.process(frame)
+        self.assertTrue(media_sources[2].visible)
+        self.assertEqual(media_sources[2].frames_served, 1)
+        self.assertFalse(media_sources[4].visible)
+        self.assertEqual(media_sources[4].frames_served, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+"""
+Unit tests for the aruco_presets module.
+"""
+
+import os
+import unittest
+import tempfile
+import shutil
+import cv2.aruco as aruco
+
+from aruco_presets import create_detector_parameters, load_detector_parameters, load_presets, save_presets
+import constants
+
+
+class TestArucoPresets(unittest.TestCase):
+    def setUp(self) -> None:
+        self.test_dir = tempfile.mkdtemp()
+        self.presets_path = os.path.join(self.test_dir, "presets.yaml")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.test_dir)
+
+    def test_create_detector_parameters(self) -> None:
+        # Values are applied with the type OpenCV expects
+        parameters = create_detector_parameters({"adaptiveThreshWinSizeMax": 11.0, "adaptiveThreshConstant": 5})
+        self.assertEqual(parameters.adaptiveThreshWinSizeMax, 11)
+        self.assertEqual(parameters.adaptiveThreshConstant, 5.0)
+        self.assertEqual(parameters.adaptiveThreshWinSizeMin, aruco.DetectorParameters().adaptiveThreshWinSizeMin)
+
+    def test_unknown_parameter(self) -> None:
+        with self.assertRaises(ValueError):
+            create_detector_parameters({"notAParameter": 1})
+
+    def test_save_and_load_presets(self) -> None:
+        presets = {"fast": {"parameters": {"adaptiveThreshWinSizeMax": 11}, "metrics": {"recall": 0.95}}}
+        save_presets(presets, self.presets_path, {"conjunto": "test"})
+        self.assertEqual(load_presets(self.presets_path), presets)
+        parameters = load_detector_parameters("fast", self.presets_path)
+        self.assertEqual(parameters.adaptiveThreshWinSizeMax, 11)
+        with self.assertRaises(ValueError):
+            load_detector_parameters("robust", self.presets_path)
+
+    def test_shipped_presets(self) -> None:
+        # The presets shipped with the project can be loaded by the detector
+        for preset in ("default", "fast", "balanced", "robust"):
+            self.assertIsInstance(load_detector_parameters(preset, constants.ARUCO_PRESETS_PATH), aruco.DetectorParameters)
+
+
+if __name__ == '__main__':
+    unittest.main()
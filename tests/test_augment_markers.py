@@ -9,9 +9,19 @@ import numpy as np
 import tempfile
 import shutil
 
-from augment_markers import load_augmented_images, find_aruco_markers, augment_aruco
+from augment_markers import (
+    load_augmented_images,
+    find_aruco_markers,
+    augment_aruco,
+    compute_tiles,
+    deduplicate_markers,
+)
+from synthetic_scene import render_marker_scene
 import constants
 
+# Maximum corner error (px) of the coarse-to-fine detection, as documented in the README
+PYRAMID_CORNER_TOLERANCE = 1.5
+
 
 class TestAugmentMarkers(unittest.TestCase):
     def setUp(self) -> None:
@@ -39,6 +49,45 @@ class TestAugmentMarkers(unittest.TestCase):
         self.assertEqual(bboxes, [])
         self.assertIsNone(ids)
 
+    def test_find_aruco_markers_pyramid_accuracy(self) -> None:
+        # Coarse-to-fine detection finds every marker and keeps corners within the tolerance
+        image, corners = render_marker_scene(1920, 1080, [0, 1, 2, 3, 4], marker_size_range=(120, 200), seed=3)
+        for levels in (1, 2):
+            bboxes, ids = find_aruco_markers(image.copy(), draw=False, pyramid_levels=levels)
+            self.assertEqual(sorted(int(marker_id) for marker_id in ids.reshape(-1)), sorted(corners))
+            for bbox, marker_id in zip(bboxes, ids.reshape(-1)):
+                error = np.linalg.norm(bbox.reshape(4, 2) - corners[int(marker_id)], axis=1).max()
+                self.assertLess(error, PYRAMID_CORNER_TOLERANCE)
+
+    def test_find_aruco_markers_pyramid_no_marker(self) -> None:
+        blank_image = np.zeros((1080, 1920, 3), dtype=np.uint8)
+        _, ids = find_aruco_markers(blank_image, draw=False, pyramid_levels=2)
+        self.assertIsNone(ids)
+
+    def test_find_aruco_markers_tiled_matches_full_frame(self) -> None:
+        # Tiled detection returns the same markers and corners as a single full-frame call
+        image, _ = render_marker_scene(1920, 1080, list(range(20)), marker_size_range=(60, 160), seed=2)
+        full_bboxes, full_ids = find_aruco_markers(image.copy(), draw=False)
+        tiled_bboxes, tiled_ids = find_aruco_markers(image.copy(), draw=False, tile_grid=(2, 3))
+        full = {int(i): b.reshape(4, 2) for b, i in zip(full_bboxes, full_ids.reshape(-1))}
+        tiled = {int(i): b.reshape(4, 2) for b, i in zip(tiled_bboxes, tiled_ids.reshape(-1))}
+        self.assertEqual(len(tiled), len(tiled_bboxes))
+        self.assertEqual(set(full), set(tiled))
+        for marker_id in full:
+            np.testing.assert_allclose(full[marker_id], tiled[marker_id], atol=0.5)
+
+    def test_compute_tiles_overlap(self) -> None:
+        tiles = compute_tiles(1000, 600, (2, 2), 100)
+        self.assertEqual(tiles, [(0, 0, 550, 350), (450, 0, 1000, 350), (0, 250, 550, 600), (450, 250, 1000, 600)])
+
+    def test_deduplicate_markers(self) -> None:
+        # The same ID at the same place is merged; the same ID elsewhere is kept
+        corners = np.float32([[[10, 10], [50, 10], [50, 50], [10, 50]]])
+        candidates = [(corners, 3, 5.0), (corners + 1, 3, 20.0), (corners + 300, 3, 10.0), (corners, 4, 1.0)]
+        bboxes, ids = deduplicate_markers(candidates)
+        self.assertEqual(sorted(ids.reshape(-1).tolist()), [3, 3, 4])
+        np.testing.assert_array_equal(bboxes[0], corners + 1)
+
     def test_augment_aruco_with_valid_input(self) -> None:
         # Create dummy inputs to test augment_aruco function
         dummy_bbox = [[[ [10, 10], [110, 10], [110, 110], [10, 110] ]]]
@@ -0,0 +1,93 @@
+"""
+Unit tests for the frame_bus module.
+"""
+
+import struct
+import uuid
+import unittest
+import subprocess
+import sys
+import numpy as np
+
+from frame_bus import FrameBusPublisher, FrameBusSubscriber, build_frame_metadata, OWNER_PID_OFFSET
+
+
+class TestFrameBus(unittest.TestCase):
+    def setUp(self) -> None:
+        self.name = f"test_bus_{uuid.uuid4().hex[:8]}"
+        self.publisher = FrameBusPublisher(self.name, width=32, height=24, slots=4, meta_capacity=1024)
+        self.subscriber = FrameBusSubscriber(self.name)
+
+    def tearDown(self) -> None:
+        self.subscriber.close()
+        self.publisher.close()
+
+    def _frame(self, value: int) -> np.ndarray:
+        return np.full((24, 32, 3), value, dtype=np.uint8)
+
+    def test_publish_and_read_latest(self) -> None:
+        # The subscriber sees the published frame and its metadata
+        self.assertIsNone(self.subscriber.read_latest())
+        seq = self.publisher.publish(self._frame(5), {"markers": [{"id": 3}]})
+        bus_frame = self.subscriber.read_latest(copy=True)
+        self.assertEqual(bus_frame.seq, seq)
+        np.testing.assert_array_equal(bus_frame.frame, self._frame(5))
+        self.assertEqual(bus_frame.metadata["markers"][0]["id"], 3)
+
+    def test_zero_copy_frame_is_invalidated_on_overwrite(self) -> None:
+        self.publisher.publish(self._frame(1))
+        bus_frame = self.subscriber.next(timeout=0.1)
+        self.assertTrue(bus_frame.is_valid())
+        self.assertFalse(bus_frame.frame.flags.writeable)
+        # Publishing a full ring reuses the slot
+        for value in range(4):
+            self.publisher.publish(self._frame(value))
+        self.assertFalse(bus_frame.is_valid())
+        self.assertIsNone(self.subscriber.read(bus_frame.seq))
+        del bus_frame
+
+    def test_next_skips_overwritten_frames(self) -> None:
+        # A slow consumer jumps to the oldest available frame and counts the dropped ones
+        for value in range(10):
+            self.publisher.publish(self._frame(value))
+        bus_frame = self.subscriber.next(timeout=0.1, copy=True)
+        self.assertEqual(bus_frame.seq, 8)
+        self.assertEqual(self.subscriber.dropped, 7)
+        self.assertEqual(self.subscriber.next(timeout=0.1, copy=True).seq, 9)
+        self.assertEqual(self.subscriber.next(timeout=0.1, copy=True).seq, 10)
+        self.assertIsNone(self.subscriber.next(timeout=0.0))
+
+    def test_frame_shape_mismatch(self) -> None:
+        with self.assertRaises(ValueError):
+            self.publisher.publish(np.zeros((10, 10, 3), dtype=np.uint8))
+
+    def test_at_least_two_slots(self) -> None:
+        with self.assertRaises(ValueError):
+            FrameBusPublisher(f"test_bus_{uuid.uuid4().hex[:8]}", width=8, height=8, slots=1)
+
+    def test_existing_bus_with_live_publisher(self) -> None:
+        # A running publisher is never taken over unless explicitly requested
+        with self.assertRaises(FileExistsError):
+            FrameBusPublisher(self.name, width=32, height=24, slots=4, meta_capacity=1024)
+        replacement = FrameBusPublisher(self.name, width=32, height=24, slots=4, meta_capacity=1024, replace_stale=True)
+        replacement.close(unlink=False)
+
+    def test_existing_bus_with_dead_publisher(self) -> None:
+        # A bus left behind by a process that no longer exists is replaced
+        process = subprocess.Popen([sys.executable, "-c", "pass"])
+        process.wait()
+        struct.pack_into("<I", self.publisher.shm.buf, OWNER_PID_OFFSET, process.pid)
+        replacement = FrameBusPublisher(self.name, width=32, height=24, slots=4, meta_capacity=1024)
+        replacement.close(unlink=False)
+
+    def test_build_frame_metadata(self) -> None:
+        bbox = np.array([[[10, 10], [20, 10], [20, 20], [10, 20]]], dtype=np.float32)
+        metadata = build_frame_metadata(((bbox,), np.array([[4]])), [[8, 100, 120]], frame_index=7)
+        self.assertEqual(metadata["frame_index"], 7)
+        self.assertEqual(metadata["markers"][0]["id"], 4)
+        self.assertEqual(metadata["markers"][0]["corners"][2], [20.0, 20.0])
+        self.assertEqual(metadata["hands"], [[8, 100, 120]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+"""
+Unit tests for the logger_config module.
+"""
+
+import os
+import json
+import logging
+import unittest
+import tempfile
+import shutil
+
+import logger_config
+from logger_config import configure_logging, shutdown_logging, log_metric, RateLimitFilter
+
+
+class TestLoggerConfig(unittest.TestCase):
+    def setUp(self) -> None:
+        self.test_dir = tempfile.mkdtemp()
+        self.log_path = os.path.join(self.test_dir, "app.log")
+        self.metrics_path = os.path.join(self.test_dir, "metrics.jsonl")
+        self.root_handlers = logging.getLogger().handlers
+        self.root_level = logging.getLogger().level
+
+    def tearDown(self) -> None:
+        shutdown_logging()
+        root = logging.getLogger()
+        for handler in root.handlers:
+            handler.close()
+        root.handlers = self.root_handlers
+        root.setLevel(self.root_level)
+        shutil.rmtree(self.test_dir)
+
+    def _write_config(self, async_enabled: bool) -> str:
+        config_path = os.path.join(self.test_dir, "logging.yaml")
+        with open(config_path, "w", encoding="utf-8") as f:
+            f.write(
+                "global_level: DEBUG\n"
+                f"async:\n  enabled: {str(async_enabled).lower()}\n  queue_size: 100\n"
+                "rate_limit:\n  interval: 60.0\n  burst: 2\n"
+                "handlers:\n"
+                f"  - type: file\n    level: INFO\n    filename: {self.log_path}\n"
+                f"  - type: metrics\n    level: INFO\n    filename: {self.metrics_path}\n"
+            )
+        return config_path
+
+    def _read_lines(self, path: str) -> list:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read().splitlines()
+
+    def test_async_mode_writes_through_listener(self) -> None:
+        # Records are queued and written by the background listener
+        configure_logging(self._write_config(async_enabled=True))
+        logging.getLogger("test").info("mensaje asincrono")
+        shutdown_logging()
+        lines = self._read_lines(self.log_path)
+        self.assertEqual(len(lines), 1)
+        self.assertIn("mensaje asincrono", lines[0])
+
+    def test_dropped_records_reported_on_shutdown(self) -> None:
+        # Records dropped because the queue was full are reported once when logging shuts down
+        configure_logging(self._write_config(async_enabled=True))
+        logger_config._queue_handler.dropped_records = 3
+        shutdown_logging()
+        lines = self._read_lines(self.log_path)
+        self.assertEqual(len(lines), 1)
+        self.assertIn("Se descartaron 3 registros", lines[0])
+        self.assertEqual(self._read_lines(self.metrics_path), [])
+
+    def test_records_after_shutdown_are_written(self) -> None:
+        # After shutdown the real handlers write synchronously instead of the unread queue
+        configure_logging(self._write_config(async_enabled=True))
+        shutdown_logging()
+        logging.getLogger("test").warning("mensaje tras el cierre")
+        root_handlers = logging.getLogger().handlers
+        self.assertFalse(any(isinstance(handler, logger_config.NonBlockingQueueHandler) for handler in root_handlers))
+        lines = self._read_lines(self.log_path)
+        self.assertEqual(len(lines), 1)
+        self.assertIn("mensaje tras el cierre", lines[0])
+
+    def test_metrics_go_to_separate_file(self) -> None:
+        # Metric records are only written to the metrics handler, as JSON
+        configure_logging(self._write_config(async_enabled=False))
+        log_metric("frame", fps=30.0)
+        logging.getLogger("test").info("mensaje normal")
+        for handler in logging.getLogger().handlers:
+            handler.flush()
+        metrics = [json.loads(line) for line in self._read_lines(self.metrics_path)]
+        self.assertEqual(metrics[0]["name"], "frame")
+        self.assertEqual(metrics[0]["fps"], 30.0)
+        self.assertEqual(len(metrics), 1)
+        self.assertEqual(len(self._read_lines(self.log_path)), 1)
+
+    def test_metrics_file_rotates(self) -> None:
+        # With max_bytes the metrics file is rotated and only backup_count copies are kept
+        config_path = os.path.join(self.test_dir, "logging.yaml")
+        with open(config_path, "w", encoding="utf-8") as f:
+            f.write(
+                "global_level: DEBUG\n"
+                "handlers:\n"
+                f"  - type: metrics\n    level: INFO\n    filename: {self.metrics_path}\n"
+                "    max_bytes: 200\n    backup_count: 1\n"
+            )
+        configure_logging(config_path)
+        for idx in range(50):
+            log_metric("frame", frame=idx)
+        self.assertLessEqual(os.path.getsize(self.metrics_path), 200)
+        self.assertTrue(os.path.exists(self.metrics_path + ".1"))
+        self.assertFalse(os.path.exists(self.metrics_path + ".2"))
+
+    def test_rate_limit_suppresses_repeated_messages(self) -> None:
+        # Only `burst` records per source line are emitted within a window
+        configure_logging(self._write_config(async_enabled=False))
+        test_logger = logging.getLogger("test")
+        for idx in range(10):
+            test_logger.info(f"frame {idx}")
+        self.assertEqual(len(self._read_lines(self.log_path)), 2)
+
+    def test_rate_limit_reports_suppressed_count(self) -> None:
+        rate_filter = RateLimitFilter(interval=0.0, burst=1)
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, "mensaje", None, None)
+        self.assertTrue(rate_filter.filter(record))
+        # Force a suppressed record inside the same window
+        rate_filter.interval = 60.0
+        suppressed = logging.LogRecord("test", logging.INFO, __file__, 1, "mensaje", None, None)
+        self.assertFalse(rate_filter.filter(suppressed))
+        rate_filter.interval = 0.0
+        next_record = logging.LogRecord("test", logging.INFO, __file__, 1, "mensaje", None, None)
+        self.assertTrue(rate_filter.filter(next_record))
+        self.assertIn("suprimidos 1", next_record.getMessage())
+
+
+if __name__ == '__main__':
+    unittest.main()
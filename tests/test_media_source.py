@@ -0,0 +1,156 @@
+"""
+Unit tests for the media_source module.
+"""
+
+import os
+import time
+import shutil
+import tempfile
+import unittest
+import cv2
+import numpy as np
+
+from media_source import MediaSource, VideoMediaSource, load_media_sources
+
+
+def write_clip(path: str, num_frames: int, fps: float = 25.0, size: int = 64) -> None:
+    """
+    Writes an MJPG clip whose frame i is filled with the gray level 10 * i.
+    """
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), fps, (size, size))
+    for i in range(num_frames):
+        writer.write(np.full((size, size, 3), 10 * i, dtype=np.uint8))
+    writer.release()
+
+
+def frame_level(frame: np.ndarray) -> int:
+    return int(round(float(frame.mean()) / 10.0))
+
+
+class TestMediaSource(unittest.TestCase):
+    def test_current_frame_is_abstract(self) -> None:
+        class Incomplete(MediaSource):
+            pass
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+
+class TestVideoMediaSource(unittest.TestCase):
+    def setUp(self) -> None:
+        self.folder = tempfile.mkdtemp()
+        self.clip = os.path.join(self.folder, "3.avi")
+        write_clip(self.clip, num_frames=6)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def _wait_for_buffer(self, source: VideoMediaSource, size: int) -> None:
+        deadline = time.perf_counter() + 2.0
+        while len(source.buffer) < size and time.perf_counter() < deadline:
+            time.sleep(0.01)
+
+    def test_first_frame_available_without_visibility(self) -> None:
+        source = VideoMediaSource(self.clip, buffer_size=3)
+        try:
+            frame = source.current_frame()
+            self.assertEqual(frame.shape, (64, 64, 3))
+            self.assertEqual(frame_level(frame), 0)
+            # Hidden markers neither decode ahead nor advance
+            time.sleep(0.1)
+            self.assertEqual(len(source.buffer), 0)
+            self.assertEqual(frame_level(source.current_frame()), 0)
+        finally:
+            source.close()
+
+    def test_buffer_is_bounded(self) -> None:
+        source = VideoMediaSource(self.clip, buffer_size=3)
+        try:
+            source.set_visible(True)
+            self._wait_for_buffer(source, 3)
+            time.sleep(0.05)
+            self.assertEqual(len(source.buffer), 3)
+        finally:
+            source.close()
+
+    def test_playback_follows_clock_and_loops(self) -> None:
+        source = VideoMediaSource(self.clip, buffer_size=4)
+        try:
+            source.set_visible(True)
+            self._wait_for_buffer(source, 4)
+            # Move the playback clock forward instead of sleeping
+            source.media_time = 2.0 / source.fps
+            self.assertEqual(frame_level(source.current_frame()), 2)
+            levels = []
+            for index in range(3, 9):
+                source.media_time = index / source.fps
+                self._wait_for_buffer(source, 1)
+                levels.append(frame_level(source.current_frame()))
+            # After the last frame (5) the clip starts again
+            self.assertEqual(levels, [3, 4, 5, 0, 1, 2])
+        finally:
+            source.close()
+
+    def _long_clip(self) -> str:
+        path = os.path.join(self.folder, "4.avi")
+        write_clip(path, num_frames=20)
+        return path
+
+    def _buffered_indices(self, source: VideoMediaSource, size: int) -> list:
+        self._wait_for_buffer(source, size)
+        with source.condition:
+            return [index for index, _ in source.buffer]
+
+    def test_slow_consumer_skips_frames_it_will_not_show(self) -> None:
+        # A consumer that samples every 4th frame only gets those frames decoded; the rest are grabbed
+        source = VideoMediaSource(self._long_clip(), buffer_size=3, max_skip=10)
+        try:
+            source.consume_interval = 4.0 / source.fps
+            source.set_visible(True)
+            self.assertEqual(self._buffered_indices(source, 3), [1, 5, 9])
+            self.assertEqual(source.skipped_frames, 6)
+        finally:
+            source.close()
+
+    def test_clock_slips_instead_of_skipping_too_much(self) -> None:
+        # Past max_skip frames per decode, playback slows down instead of grabbing more
+        source = VideoMediaSource(self._long_clip(), buffer_size=3, max_skip=1)
+        try:
+            source.consume_interval = 4.0 / source.fps
+            source.set_visible(True)
+            self.assertEqual(self._buffered_indices(source, 3), [1, 3, 5])
+            self.assertLess(source.media_time, 0.0)
+        finally:
+            source.close()
+
+    def test_clock_pauses_when_hidden(self) -> None:
+        source = VideoMediaSource(self.clip)
+        try:
+            source.set_visible(True)
+            time.sleep(0.02)
+            source.set_visible(False)
+            paused_time = source.media_time
+            time.sleep(0.05)
+            self.assertEqual(source._playback_frame_index(), paused_time * source.fps)
+        finally:
+            source.close()
+
+    def test_invalid_file(self) -> None:
+        broken = os.path.join(self.folder, "7.mp4")
+        with open(broken, "wb") as f:
+            f.write(b"not a video")
+        with self.assertRaises(ValueError):
+            VideoMediaSource(broken)
+
+    def test_load_media_sources(self) -> None:
+        cv2.imwrite(os.path.join(self.folder, "1.png"), np.zeros((8, 8, 3), dtype=np.uint8))
+        sources = load_media_sources(self.folder)
+        try:
+            self.assertEqual(list(sources), [3])
+        finally:
+            for source in sources.values():
+                source.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Unit tests for the multi_camera module.
+"""
+
+import time
+import queue
+import threading
+import multiprocessing
+import unittest
+from unittest import mock
+import numpy as np
+
+from multi_camera import SharedImageStore, MultiCameraRuntime, camera_worker, format_report, join_workers
+
+
+class TestSharedImageStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.images = {
+            1: np.full((20, 30, 3), 7, dtype=np.uint8),
+            4: np.arange(10 * 10 * 3, dtype=np.uint8).reshape(10, 10, 3)
+        }
+        self.store = SharedImageStore.create(self.images)
+
+    def tearDown(self) -> None:
+        self.store.close()
+
+    def test_attach_returns_same_images(self) -> None:
+        # Attaching by descriptor exposes the same pixels without copying them
+        attached = SharedImageStore.attach(self.store.descriptor())
+        try:
+            for marker_id, image in self.images.items():
+                np.testing.assert_array_equal(attached.images[marker_id], image)
+        finally:
+            attached.close()
+
+    def test_images_are_read_only(self) -> None:
+        with self.assertRaises(ValueError):
+            self.store.images[1][0, 0, 0] = 0
+
+
+class TestMultiCameraRuntime(unittest.TestCase):
+    def test_thread_mode_reports_every_camera(self) -> None:
+        # Each synthetic camera runs its own pipeline and reports its metrics
+        images = {0: np.zeros((50, 50, 3), dtype=np.uint8)}
+        runtime = MultiCameraRuntime(["synthetic", "synthetic"], images, mode="thread", enable_hand_detection=False)
+        reports, wall_time = runtime.run(duration=0.5)
+        self.assertEqual([report["camera_id"] for report in reports], [0, 1])
+        for report in reports:
+            self.assertGreater(report["frames"], 0)
+            self.assertGreater(report["fps"], 0)
+        self.assertIn("total: 2", format_report(reports, wall_time))
+
+    def test_worker_reports_when_capture_fails(self) -> None:
+        # A camera that cannot be opened still posts an (empty) summary
+        results: queue.Queue = queue.Queue()
+        store = SharedImageStore.create({0: np.zeros((10, 10, 3), dtype=np.uint8)})
+        try:
+            with mock.patch("multi_camera.open_capture", side_effect=RuntimeError("no camera")):
+                with self.assertRaises(RuntimeError):
+                    camera_worker(0, "missing", store, results, threading.Event(), duration=1.0)
+        finally:
+            store.close()
+        self.assertEqual(results.get_nowait()["frames"], 0)
+
+    def test_join_workers_gives_up_after_timeout(self) -> None:
+        # A stuck thread is abandoned and a stuck process is terminated once the timeout expires
+        release = threading.Event()
+        thread = threading.Thread(target=release.wait, daemon=True)
+        process = multiprocessing.get_context("spawn").Process(target=time.sleep, args=(60,), daemon=True)
+        thread.start()
+        process.start()
+        try:
+            start = time.perf_counter()
+            stragglers = join_workers([thread, process], timeout=0.2)
+            self.assertLess(time.perf_counter() - start, 5.0)
+            self.assertEqual(stragglers, [thread, process])
+            self.assertFalse(process.is_alive())
+        finally:
+            release.set()
+            thread.join()
+
+    def test_unknown_mode(self) -> None:
+        with self.assertRaises(ValueError):
+            MultiCameraRuntime(["synthetic"], {}, mode="gpu")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+Unit tests for the overlay_scheduler module.
+"""
+
+import unittest
+import numpy as np
+
+from overlay_scheduler import (
+    OverlayScheduler, quad_area, visible_fraction, CULLED, APPROXIMATE, REUSED, FULL
+)
+
+
+def square(x: float, y: float, side: float) -> np.ndarray:
+    return np.array([[x, y], [x + side, y], [x + side, y + side], [x, y + side]], dtype=np.float32)
+
+
+class TestOverlayScheduler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.content = np.full((50, 50, 3), (10, 20, 30), dtype=np.uint8)
+        self.scheduler = OverlayScheduler(
+            min_area=64, approx_area=900, near_area=10000, label_min_area=2500, min_visible_fraction=0.25,
+            far_refresh_interval=3, reuse_tolerance=1.0, frame_budget=0.6
+        )
+
+    def _actions(self, markers, frame_shape=(400, 400, 3), get_content=None):
+        frame = np.zeros(frame_shape, dtype=np.uint8)
+        self.scheduler.composite(frame, markers, get_content or (lambda marker_id: self.content))
+        return [decision.action for decision in self.scheduler.last_decisions]
+
+    def test_geometry(self) -> None:
+        self.assertAlmostEqual(quad_area(square(0, 0, 10)), 100.0)
+        self.assertAlmostEqual(visible_fraction(square(-5, 0, 10), 100, 100), 0.5)
+        self.assertEqual(visible_fraction(square(200, 0, 10), 100, 100), 0.0)
+
+    def test_size_and_visibility_levels(self) -> None:
+        requested = []
+
+        def get_content(marker_id: int) -> np.ndarray:
+            requested.append(marker_id)
+            return self.content
+
+        markers = [
+            (0, square(10, 10, 5)),      # Demasiado pequeño
+            (1, square(500, 10, 100)),   # Fuera del frame
+            (2, square(100, 10, 20)),    # Pequeño
+            (3, square(-90, 200, 100)),  # Casi fuera del frame
+            (4, square(150, 150, 100)),  # Cercano
+        ]
+        self.assertEqual(self._actions(markers, get_content=get_content), [CULLED, CULLED, APPROXIMATE, APPROXIMATE, FULL])
+        # The content of culled markers is never requested
+        self.assertEqual(sorted(requested), [2, 3, 4])
+        labels = [decision.draw_label for decision in self.scheduler.last_decisions]
+        self.assertEqual(labels, [False, False, False, False, True])
+
+    def test_reuse_when_still_or_translated(self) -> None:
+        self.assertEqual(self._actions([(1, square(50, 50, 100))]), [FULL])
+        self.assertEqual(self._actions([(1, square(50.5, 50, 100))]), [REUSED])
+        # A pure translation reuses the cached warp at an integer offset
+        self.assertEqual(self._actions([(1, square(60, 50, 100))]), [REUSED])
+        self.assertEqual(self.scheduler.last_decisions[0].shift, (10, 0))
+        # A change of shape (scale) needs a new warp
+        self.assertEqual(self._actions([(1, square(60, 50, 110))]), [FULL])
+
+    def test_far_markers_refresh_less_often(self) -> None:
+        # Animated content: a new frame every call
+        def get_content(marker_id: int) -> np.ndarray:
+            return self.content.copy()
+
+        far = [(1, square(50, 50, 50))]
+        near = [(1, square(50, 50, 150))]
+        self.assertEqual([self._actions(far, get_content=get_content)[0] for _ in range(6)],
+                         [FULL, REUSED, REUSED, FULL, REUSED, REUSED])
+        self.scheduler = OverlayScheduler(far_refresh_interval=3)
+        self.assertEqual([self._actions(near, get_content=get_content)[0] for _ in range(3)], [FULL, FULL, FULL])
+
+    def test_budget_prioritizes_largest(self) -> None:
+        # Budget: 0.6 * 200 * 220 = 26400 px of warped area; the smallest marker no longer fits
+        self.scheduler.marker_cost = 0.0
+        markers = [(1, square(0, 0, 90)), (2, square(100, 0, 100)), (3, square(0, 95, 110))]
+        self.assertEqual(self._actions(markers, frame_shape=(200, 220, 3)), [APPROXIMATE, FULL, FULL])
+
+    def test_budget_charges_every_drawn_marker(self) -> None:
+        # Reused and approximated markers also consume the budget, so once it is spent the
+        # remaining (smallest) markers are culled instead of drawn for free
+        self.scheduler = OverlayScheduler(min_area=64, approx_area=900, frame_budget=700 / (400 * 400),
+                                          reuse_cost=0.1, approx_cost=0.1, marker_cost=100.0)
+        markers = [(1, square(0, 0, 40))] + [(marker_id, square(50 * marker_id, 100, 20)) for marker_id in range(2, 8)]
+        # Budget 700: the first warp costs 1600 + 100 and is always drawn, nothing else fits
+        self.assertEqual(self._actions(markers), [FULL] + [CULLED] * 6)
+        # The still marker is reused (160 + 100), then three approximations (40 + 100 each) fit
+        self.assertEqual(self._actions(markers), [REUSED] + [APPROXIMATE] * 3 + [CULLED] * 3)
+
+    def test_composite(self) -> None:
+        frame = np.full((200, 200, 3), 255, dtype=np.uint8)
+        markers = [(1, square(20, 20, 100)), (2, square(150, 150, 20)), (3, square(150, 10, 5))]
+        result = self.scheduler.composite(frame, markers, lambda marker_id: self.content)
+        # Full overlay and mean-colour approximation show the content colour; culled markers are untouched
+        np.testing.assert_array_equal(result[70, 70], (10, 20, 30))
+        np.testing.assert_array_equal(result[160, 160], (10, 20, 30))
+        np.testing.assert_array_equal(result[12, 152], (255, 255, 255))
+        # The cached warp is composited again, moved with the marker
+        frame = np.full((200, 200, 3), 255, dtype=np.uint8)
+        result = self.scheduler.composite(frame, [(1, square(60, 20, 100))], lambda marker_id: self.content)
+        self.assertEqual(self.scheduler.last_decisions[0].action, REUSED)
+        np.testing.assert_array_equal(result[70, 150], (10, 20, 30))
+        np.testing.assert_array_equal(result[70, 40], (255, 255, 255))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+"""
+Unit tests for the synthetic_scene module.
+"""
+
+import unittest
+import numpy as np
+
+from synthetic_scene import render_marker_scene, SyntheticCapture
+
+
+class TestSyntheticScene(unittest.TestCase):
+    def test_render_marker_scene_returns_corners(self) -> None:
+        frame, corners = render_marker_scene(640, 480, [0, 3, 7], seed=1)
+        self.assertEqual(frame.shape, (480, 640, 3))
+        self.assertEqual(sorted(corners), [0, 3, 7])
+        for marker_corners in corners.values():
+            self.assertEqual(marker_corners.shape, (4, 2))
+
+    def test_render_is_reproducible(self) -> None:
+        frame_a, _ = render_marker_scene(320, 240, [1], seed=5)
+        frame_b, _ = render_marker_scene(320, 240, [1], seed=5)
+        np.testing.assert_array_equal(frame_a, frame_b)
+
+    def test_synthetic_capture_read(self) -> None:
+        cap = SyntheticCapture(width=320, height=240, num_frames=2)
+        ret, frame = cap.read()
+        self.assertTrue(ret)
+        self.assertEqual(frame.shape, (240, 320, 3))
+        cap.release()
+        self.assertEqual(cap.read(), (False, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
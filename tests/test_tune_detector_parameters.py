@@ -0,0 +1,64 @@
+"""
+Unit tests for the tune_detector_parameters module.
+"""
+
+import unittest
+import numpy as np
+
+from tune_detector_parameters import (
+    evaluate_parameters,
+    format_report,
+    pareto_front,
+    random_settings,
+    select_presets,
+    synthetic_dataset,
+)
+
+
+def make_result(name: str, time_ms: float, recall: float) -> dict:
+    return {"name": name, "parameters": {}, "metrics": {"time_ms": time_ms, "recall": recall}}
+
+
+class TestTuneDetectorParameters(unittest.TestCase):
+    def test_pareto_front(self) -> None:
+        # Dominated configurations (slower and with lower recall) are excluded
+        results = [make_result("a", 5, 0.8), make_result("b", 10, 0.95), make_result("c", 12, 0.9),
+                   make_result("d", 30, 1.0), make_result("e", 40, 1.0)]
+        self.assertEqual([result["name"] for result in pareto_front(results)], ["a", "b", "d"])
+
+    def test_select_presets(self) -> None:
+        front = [make_result("a", 5, 0.8), make_result("b", 10, 0.95), make_result("c", 15, 0.99),
+                 make_result("d", 30, 1.0)]
+        presets = select_presets(front, fast_min_recall=0.9, balanced_tolerance=0.02)
+        self.assertEqual(presets["fast"]["name"], "b")
+        self.assertEqual(presets["balanced"]["name"], "c")
+        self.assertEqual(presets["robust"]["name"], "d")
+
+    def test_select_presets_empty_front(self) -> None:
+        with self.assertRaises(ValueError):
+            select_presets([])
+
+    def test_format_report_without_default(self) -> None:
+        # The default configuration may have been dropped after an OpenCV error
+        result = make_result("a", 5, 0.9)
+        result["metrics"].update(false_positives=0.0, corner_error_px=0.5)
+        report = format_report([result], [result], {"fast": result}, {"conjunto": "test"})
+        self.assertIn("| fast | 5.00 | 0.900 |", report)
+        self.assertNotIn("default (OpenCV)", report)
+
+    def test_evaluate_parameters_on_synthetic_dataset(self) -> None:
+        samples = synthetic_dataset(3, width=320, height=240)
+        metrics = evaluate_parameters({}, samples, repeats=1)
+        self.assertGreater(metrics["recall"], 0.5)
+        self.assertEqual(metrics["false_positives"], 0.0)
+        self.assertGreater(metrics["time_ms"], 0.0)
+
+    def test_random_settings_are_consistent(self) -> None:
+        rng = np.random.default_rng(0)
+        for _ in range(20):
+            settings = random_settings(rng)
+            self.assertGreaterEqual(settings["adaptiveThreshWinSizeMax"], settings["adaptiveThreshWinSizeMin"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,350 @@
+"""
+Herramienta para ajustar ``aruco.DetectorParameters`` buscando el compromiso entre velocidad y recall.
+
+Evalúa conjuntos de parámetros (búsqueda aleatoria más los valores por defecto de OpenCV) sobre un
+conjunto de datos sintético o etiquetado, midiendo el tiempo de detección, el recall, los falsos
+positivos y el error de las esquinas para el diccionario ``ARUCO_DICT``. Con el frente de Pareto
+(tiempo frente a recall) elige los presets "fast", "balanced" y "robust", los guarda en
+``ARUCO_PRESETS_PATH`` y genera un informe en Markdown.
+
+Conjunto de datos etiquetado: una carpeta con imágenes y un ``labels.yaml`` con, para cada imagen,
+la lista de IDs presentes o un diccionario ID -> 4 esquinas ([[x, y], ...]).
+
+Uso:
+    python tune_detector_parameters.py                        # conjunto sintético
+    python tune_detector_parameters.py --dataset datos/ --trials 200
+"""
+
+import os
+import time
+import argparse
+import datetime
+import cv2
+import cv2.aruco as aruco
+import numpy as np
+import yaml
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from aruco_presets import create_detector_parameters, save_presets
+from synthetic_scene import render_marker_scene
+import constants
+
+# Ejemplo etiquetado: imagen en escala de grises e IDs con sus esquinas (None si solo se conoce el ID)
+Sample = Tuple[np.ndarray, Dict[int, Optional[np.ndarray]]]
+
+# Espacio de búsqueda: parámetro -> valores posibles
+SEARCH_SPACE: Dict[str, Sequence[Any]] = {
+    "adaptiveThreshWinSizeMin": (3, 5, 7, 11, 15),
+    "adaptiveThreshWinSizeMax": (7, 11, 15, 23, 35, 53),
+    "adaptiveThreshWinSizeStep": (4, 6, 10, 20, 40),
+    "adaptiveThreshConstant": (5.0, 7.0, 10.0),
+    "polygonalApproxAccuracyRate": (0.03, 0.05, 0.08),
+    "minMarkerPerimeterRate": (0.01, 0.03, 0.05),
+    "perspectiveRemovePixelPerCell": (2, 3, 4, 8),
+    "perspectiveRemoveIgnoredMarginPerCell": (0.13, 0.2, 0.3),
+    # CORNER_REFINE_CONTOUR se excluye: con algunos contornos OpenCV falla con una aserción
+    "cornerRefinementMethod": (aruco.CORNER_REFINE_NONE, aruco.CORNER_REFINE_SUBPIX),
+    "useAruco3Detection": (False, True),
+    "minSideLengthCanonicalImg": (16, 24, 32),
+}
+
+
+def synthetic_dataset(
+    num_scenes: int,
+    width: int = constants.CAMERA_WIDTH,
+    height: int = constants.CAMERA_HEIGHT,
+    seed: int = 0
+) -> List[Sample]:
+    """
+    Genera escenas sintéticas variadas (tamaño, rotación, desenfoque, ruido y brillo) más algunas
+    escenas sin marcadores para contabilizar falsos positivos.
+
+    Args:
+        num_scenes (int): Número de escenas con marcadores.
+        width (int): Ancho de las escenas.
+        height (int): Alto de las escenas.
+        seed (int): Semilla del generador.
+
+    Returns:
+        List[Sample]: Escenas en escala de grises con sus etiquetas.
+    """
+    rng = np.random.default_rng(seed)
+    dictionary_size = aruco.getPredefinedDictionary(constants.ARUCO_DICT).bytesList.shape[0]
+    samples: List[Sample] = []
+    for idx in range(num_scenes):
+        marker_ids = rng.choice(dictionary_size, size=int(rng.integers(2, 7)), replace=False)
+        frame, corners = render_marker_scene(
+            width, height, marker_ids.tolist(),
+            marker_size_range=(18, 150),
+            max_rotation=45.0,
+            perspective_jitter=0.1,
+            noise_sigma=float(rng.uniform(0.0, 12.0)),
+            blur_kernel=int(rng.choice([0, 0, 3, 5, 7])),
+            brightness=float(rng.uniform(0.3, 1.1)),
+            seed=seed + idx
+        )
+        samples.append((cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), dict(corners)))
+    for idx in range(max(1, num_scenes // 5)):
+        empty, _ = render_marker_scene(width, height, [], noise_sigma=float(rng.uniform(0.0, 8.0)), seed=seed + 1000 + idx)
+        samples.append((cv2.cvtColor(empty, cv2.COLOR_BGR2GRAY), {}))
+    return samples
+
+
+def load_labeled_dataset(folder_path: str) -> List[Sample]:
+    """
+    Carga un conjunto de datos etiquetado (imágenes más ``labels.yaml``).
+
+    Args:
+        folder_path (str): Carpeta del conjunto de datos.
+
+    Returns:
+        List[Sample]: Imágenes en escala de grises con sus etiquetas.
+    """
+    labels_path = os.path.join(folder_path, "labels.yaml")
+    if not os.path.exists(labels_path):
+        raise FileNotFoundError(f"No se encontró el archivo de etiquetas: {labels_path}")
+    with open(labels_path, 'r', encoding='utf-8') as f:
+        labels: Dict[str, Any] = yaml.safe_load(f) or {}
+
+    samples: List[Sample] = []
+    for image_file, image_labels in labels.items():
+        image = cv2.imread(os.path.join(folder_path, image_file), cv2.IMREAD_GRAYSCALE)
+        if image is None:
+            raise ValueError(f"La imagen {image_file} no se pudo cargar.")
+        if isinstance(image_labels, dict):
+            markers = {int(marker_id): np.float32(corners).reshape(4, 2) for marker_id, corners in image_labels.items()}
+        else:
+            markers = {int(marker_id): None for marker_id in image_labels or []}
+        samples.append((image, markers))
+    return samples
+
+
+def evaluate_parameters(settings: Mapping[str, Any], samples: Sequence[Sample], repeats: int = 2) -> Dict[str, float]:
+    """
+    Mide un conjunto de parámetros sobre el conjunto de datos.
+
+    Args:
+        settings (Mapping[str, Any]): Parámetros que difieren de los valores por defecto.
+        samples (Sequence[Sample]): Conjunto de datos.
+        repeats (int): Pasadas de medición; se toma el mejor tiempo de cada imagen.
+
+    Returns:
+        Dict[str, float]: Tiempo medio por imagen (ms), recall, falsos positivos por imagen y
+        error medio de las esquinas (px).
+    """
+    detector = aruco.ArucoDetector(aruco.getPredefinedDictionary(constants.ARUCO_DICT),
+                                   create_detector_parameters(settings))
+    detector.detectMarkers(samples[0][0])  # Calentamiento
+
+    best_times = [float("inf")] * len(samples)
+    found, expected, false_positives = 0, 0, 0
+    corner_errors: List[float] = []
+    for repeat in range(repeats):
+        for idx, (image, labels) in enumerate(samples):
+            start = time.perf_counter()
+            bboxes, ids, _ = detector.detectMarkers(image)
+            best_times[idx] = min(best_times[idx], time.perf_counter() - start)
+            if repeat > 0:
+                continue
+            expected += len(labels)
+            detected = {} if ids is None else {int(i): b.reshape(4, 2) for b, i in zip(bboxes, ids.reshape(-1))}
+            for marker_id, corners in detected.items():
+                if marker_id not in labels:
+                    false_positives += 1
+                    continue
+                found += 1
+                if labels[marker_id] is not None:
+                    corner_errors.append(float(np.linalg.norm(corners - labels[marker_id], axis=1).mean()))
+
+    return {
+        "time_ms": float(np.mean(best_times) * 1000.0),
+        "recall": found / expected if expected else 1.0,
+        "false_positives": false_positives / len(samples),
+        "corner_error_px": float(np.mean(corner_errors)) if corner_errors else float("nan"),
+    }
+
+
+def random_settings(rng: np.random.Generator) -> Dict[str, Any]:
+    """
+    Elige un conjunto de parámetros aleatorio y coherente del espacio de búsqueda.
+
+    Args:
+        rng (np.random.Generator): Generador aleatorio.
+
+    Returns:
+        Dict[str, Any]: Parámetros elegidos.
+    """
+    settings = {name: values[int(rng.integers(len(values)))] for name, values in SEARCH_SPACE.items()}
+    for name, value in settings.items():
+        settings[name] = value.item() if isinstance(value, np.generic) else value
+    if settings["adaptiveThreshWinSizeMax"] < settings["adaptiveThreshWinSizeMin"]:
+        settings["adaptiveThreshWinSizeMax"] = settings["adaptiveThreshWinSizeMin"]
+    if not settings["useAruco3Detection"]:
+        del settings["minSideLengthCanonicalImg"]
+    return settings
+
+
+def pareto_front(results: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Devuelve los resultados no dominados: ningún otro es a la vez más rápido y con mayor recall.
+
+    Args:
+        results (Sequence[Dict[str, Any]]): Resultados con ``metrics`` (``time_ms`` y ``recall``).
+
+    Returns:
+        List[Dict[str, Any]]: Frente de Pareto ordenado por tiempo.
+    """
+    front: List[Dict[str, Any]] = []
+    best_recall = -1.0
+    for result in sorted(results, key=lambda item: (item["metrics"]["time_ms"], -item["metrics"]["recall"])):
+        if result["metrics"]["recall"] > best_recall:
+            front.append(result)
+            best_recall = result["metrics"]["recall"]
+    return front
+
+
+def select_presets(
+    front: Sequence[Dict[str, Any]],
+    fast_min_recall: float = 0.9,
+    balanced_tolerance: float = 0.02
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Elige los presets a partir del frente de Pareto.
+
+    - robust: el de mayor recall.
+    - balanced: el más rápido cuyo recall está a menos de ``balanced_tolerance`` del de robust.
+    - fast: el más rápido con recall de al menos ``fast_min_recall``.
+
+    Args:
+        front (Sequence[Dict[str, Any]]): Frente de Pareto ordenado por tiempo.
+        fast_min_recall (float): Recall mínimo del preset rápido.
+        balanced_tolerance (float): Pérdida de recall admitida para el preset equilibrado.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Presets por nombre.
+    """
+    if not front:
+        raise ValueError("El frente de Pareto está vacío: ninguna configuración cumple el límite de falsos positivos")
+    robust = max(front, key=lambda item: (item["metrics"]["recall"], -item["metrics"]["time_ms"]))
+    max_recall = robust["metrics"]["recall"]
+    balanced = next(item for item in front if item["metrics"]["recall"] >= max_recall - balanced_tolerance)
+    fast = next((item for item in front if item["metrics"]["recall"] >= fast_min_recall), balanced)
+    return {"fast": fast, "balanced": balanced, "robust": robust}
+
+
+def format_report(
+    results: Sequence[Dict[str, Any]],
+    front: Sequence[Dict[str, Any]],
+    presets: Mapping[str, Dict[str, Any]],
+    metadata: Mapping[str, Any]
+) -> str:
+    """
+    Genera el informe en Markdown con el frente de Pareto y los presets elegidos.
+    """
+    def row(name: str, result: Dict[str, Any]) -> str:
+        metrics = result["metrics"]
+        settings = ", ".join(f"{key}={value}" for key, value in result["parameters"].items()) or "(valores por defecto)"
+        return (f"| {name} | {metrics['time_ms']:.2f} | {metrics['recall']:.3f} | {metrics['false_positives']:.2f} "
+                f"| {metrics['corner_error_px']:.2f} | {settings} |")
+
+    header = ["| Config | Tiempo (ms) | Recall | FP/imagen | Error esquinas (px) | Parámetros |",
+              "|---|---|---|---|---|---|"]
+    # La configuración por defecto puede haberse descartado por un error de OpenCV
+    default = next((result for result in results if result["name"] == "default"), None)
+    lines = [
+        "# Ajuste de aruco.DetectorParameters",
+        "",
+        "".join(f"- {key}: {value}\n" for key, value in metadata.items()),
+        "## Presets",
+        "",
+        *header,
+        *([row("default (OpenCV)", default)] if default is not None else []),
+        *(row(name, preset) for name, preset in presets.items()),
+        "",
+        f"## Frente de Pareto ({len(front)} de {len(results)} configuraciones sin falsos positivos)",
+        "",
+        *header,
+        *(row(result["name"], result) for result in front),
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Ajuste de aruco.DetectorParameters (velocidad frente a recall).")
+    parser.add_argument("--dataset", default=None, help="Carpeta con imágenes y labels.yaml (por defecto, sintético).")
+    parser.add_argument("--scenes", type=int, default=40, help="Número de escenas sintéticas.")
+    parser.add_argument("--width", type=int, default=constants.CAMERA_WIDTH)
+    parser.add_argument("--height", type=int, default=constants.CAMERA_HEIGHT)
+    parser.add_argument("--trials", type=int, default=80, help="Configuraciones aleatorias a evaluar.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fast-min-recall", type=float, default=0.9)
+    parser.add_argument("--balanced-tolerance", type=float, default=0.02)
+    parser.add_argument("--max-false-positives", type=float, default=0.0,
+                        help="Falsos positivos por imagen admitidos en el frente de Pareto.")
+    parser.add_argument("--output", default=constants.ARUCO_PRESETS_PATH)
+    parser.add_argument("--report", default="reports/aruco_pareto.md")
+    args = parser.parse_args()
+
+    if args.dataset:
+        samples = load_labeled_dataset(args.dataset)
+        dataset_name = args.dataset
+    else:
+        samples = synthetic_dataset(args.scenes, args.width, args.height, args.seed)
+        dataset_name = f"sintético, {len(samples)} escenas {args.width}x{args.height} (semilla {args.seed})"
+
+    rng = np.random.default_rng(args.seed)
+    candidates: List[Tuple[str, Dict[str, Any]]] = [("default", {})]
+    candidates += [(f"trial-{idx}", random_settings(rng)) for idx in range(args.trials)]
+
+    results: List[Dict[str, Any]] = []
+    for idx, (name, settings) in enumerate(candidates):
+        try:
+            metrics = evaluate_parameters(settings, samples)
+        except cv2.error as e:
+            # Algunas combinaciones hacen fallar a OpenCV en ciertas imágenes: no son aptas como preset
+            print(f"[{idx + 1}/{len(candidates)}] {name}: descartada, error de OpenCV: {str(e).strip()[-80:]}")
+            continue
+        results.append({"name": name, "parameters": settings, "metrics": metrics})
+        print(f"[{idx + 1}/{len(candidates)}] {name}: {metrics['time_ms']:.2f} ms, recall {metrics['recall']:.3f}, "
+              f"FP {metrics['false_positives']:.2f}")
+
+    valid = [result for result in results if result["metrics"]["false_positives"] <= args.max_false_positives]
+    if not valid:
+        min_false_positives = min((result["metrics"]["false_positives"] for result in results), default=None)
+        detail = f" (mínimo medido: {min_false_positives:.2f} por imagen)" if min_false_positives is not None else ""
+        raise SystemExit(
+            f"Ninguna configuración tiene como mucho {args.max_false_positives} falsos positivos por imagen{detail}. "
+            f"Si el conjunto tiene marcadores sin etiquetar, etiquétalos o sube --max-false-positives."
+        )
+    front = pareto_front(valid)
+    selected = select_presets(front, args.fast_min_recall, args.balanced_tolerance)
+
+    metadata = {
+        "diccionario": next((name for name in dir(aruco) if name.startswith("DICT_")
+                             and getattr(aruco, name) == constants.ARUCO_DICT), constants.ARUCO_DICT),
+        "conjunto": dataset_name,
+        "configuraciones": len(results),
+        "opencv": cv2.__version__,
+        "fecha": datetime.date.today().isoformat(),
+    }
+    presets = {
+        name: {
+            "parameters": dict(result["parameters"]),
+            "metrics": {key: round(value, 4) for key, value in result["metrics"].items()},
+        }
+        for name, result in selected.items()
+    }
+    save_presets(presets, args.output, metadata)
+
+    report = format_report(results, front, selected, metadata)
+    report_dir = os.path.dirname(args.report)
+    if report_dir and not os.path.exists(report_dir):
+        os.makedirs(report_dir, exist_ok=True)
+    with open(args.report, 'w', encoding='utf-8') as f:
+        f.write(report)
+    print(report)
+
+
+if __name__ == "__main__":
+    main()